@@ -0,0 +1,99 @@
+from utils.neo4j_connector import Neo4jConnector
+from utils.ingestion.dedup_sections import deduplicate_folders
+
+BATCH_SIZE = 500
+
+# Which chunk is canonical depends on record order and content, so a
+# re-run drops the old links of every product it covers (and of all its
+# sections, including ones that no longer produce any chunk) first.
+# Two statements: matching both edge sets at once multiplies them.
+clear_product_links_query = """
+UNWIND $product_ids AS pid
+MATCH (:Product {product_id: pid})-[r:HAS_CHUNK]->(:Chunk)
+DELETE r
+"""
+
+clear_section_links_query = """
+UNWIND $product_ids AS pid
+MATCH (:Product {product_id: pid})-[:HAS_DOCUMENT]->(:Document)-[:HAS_SECTION]->(:Section)-[r:HAS_CHUNK]->(:Chunk)
+DELETE r
+"""
+
+# Chunks no section points at any more
+delete_orphan_chunks_query = """
+MATCH (c:Chunk)
+WHERE NOT (:Section)-[:HAS_CHUNK]->(c)
+DETACH DELETE c
+"""
+
+# Canonical text is stored once; every product that uses it links to it
+chunk_query = """
+UNWIND $rows AS row
+MERGE (c:Chunk {chunk_id: row.chunk_id})
+SET c.text = row.text,
+    c.text_hash = row.text_hash,
+    c.shared = row.shared
+WITH c, row
+UNWIND row.product_ids AS pid
+MATCH (p:Product {product_id: pid})
+MERGE (p)-[:HAS_CHUNK]->(c)
+"""
+
+# Each section points at the canonical chunk for every one of its positions
+section_link_query = """
+UNWIND $rows AS row
+MATCH (s:Section {section_id: row.section_id})
+MATCH (c:Chunk {chunk_id: row.canonical_id})
+MERGE (s)-[r:HAS_CHUNK {position: row.position}]->(c)
+"""
+
+
+def _batches(rows, size=BATCH_SIZE):
+    for i in range(0, len(rows), size):
+        yield rows[i:i + size]
+
+
+def run_create_chunks(folders=("parsed_json/Accounts", "parsed_json/parsed_creditcards")):
+    result, records = deduplicate_folders(*folders)
+
+    chunk_rows = [
+        {
+            "chunk_id": cid,
+            "text": rec["text"],
+            "text_hash": rec["text_hash"],
+            "shared": len(result.products[cid]) > 1,
+            "product_ids": sorted(result.products[cid]),
+        }
+        for cid, rec in result.canonical.items()
+    ]
+    link_rows = [
+        {
+            "section_id": rec["section_id"],
+            "position": rec["position"],
+            "canonical_id": result.mapping[rec["chunk_id"]],
+        }
+        for rec in records
+    ]
+
+    product_ids = sorted({rec["product_id"] for rec in records})
+
+    db = Neo4jConnector()
+    for ids in _batches(product_ids, 10):
+        db.write(clear_product_links_query, {"product_ids": ids})
+        db.write(clear_section_links_query, {"product_ids": ids})
+
+    for rows in _batches(chunk_rows):
+        db.write(chunk_query, {"rows": rows})
+    for rows in _batches(link_rows):
+        db.write(section_link_query, {"rows": rows})
+
+    db.write(delete_orphan_chunks_query)
+    db.close()
+
+    print(result.report.summary())
+    print("All chunks created successfully.")
+    return result.report
+
+
+if __name__ == "__main__":
+    run_create_chunks()
@@ -0,0 +1,279 @@
+# utils/analytics/portfolio_views.py
+
+import hashlib
+import json
+from pathlib import Path
+
+import pandas as pd
+
+from utils.config import load_config, write_atomic
+
+# --------------------------------------------
+# FILE PATTERNS PER BATCH
+# The root of the customer data folder is "batch1"; every sub-folder
+# (batch2/, ...) is a later batch with the same three files.
+# --------------------------------------------
+BATCH_FILES = {
+    "customers": "customers_*.csv",
+    "cards": "customer_credit_card_holdings_*.csv",
+    "accounts": "customer_account_holdings_*.csv",
+}
+
+UTILIZATION_BANDS = [0, 0.1, 0.3, 0.5, 0.75, 1.0, float("inf")]
+UTILIZATION_LABELS = ["0-10%", "10-30%", "30-50%", "50-75%", "75-100%", ">100%"]
+
+# --------------------------------------------
+# VIEWS: group keys + additive columns
+# Only sums and counts are stored per batch, so batches can be added or
+# replaced independently; ratios and card names are attached after
+# combining, so editing the card metadata never touches the partials.
+# Bump CACHE_VERSION when the partials' layout changes.
+# --------------------------------------------
+CACHE_VERSION = "2"
+
+VIEW_KEYS = {
+    "utilization_by_segment": ["customer_segment", "utilization_band"],
+    "delinquent_by_card": ["card_id"],
+    "dormant_by_city": ["city"],
+    "accounts_by_type": ["account_type", "account_status"],
+}
+
+
+# ============================================================
+# 1. Loading
+# ============================================================
+def _bool(series):
+    # batch1 writes TRUE/FALSE, batch2 True/False
+    return series.astype(str).str.strip().str.lower().eq("true")
+
+
+def discover_batches(root):
+    """{batch_name: {"customers": path, "cards": path, "accounts": path}}"""
+    root = Path(root)
+    batches = {}
+    for name, folder in [("batch1", root)] + [
+        (d.name, d) for d in sorted(root.iterdir()) if d.is_dir()
+    ]:
+        files = {}
+        for kind, pattern in BATCH_FILES.items():
+            found = sorted(folder.glob(pattern))
+            if found:
+                files[kind] = found[0]
+        if len(files) == len(BATCH_FILES):
+            batches[name] = files
+    return batches
+
+
+def load_card_names(path):
+    return (
+        pd.read_csv(path, usecols=["card_id", "card_name"])
+        .set_index("card_id")["card_name"].to_dict()
+    )
+
+
+def fingerprint(files):
+    h = hashlib.sha1()
+    for kind in sorted(files):
+        h.update(kind.encode())
+        h.update(Path(files[kind]).read_bytes())
+    return h.hexdigest()
+
+
+# ============================================================
+# 2. Per-batch aggregation (vectorized)
+# ============================================================
+def aggregate_batch(files):
+    customers = pd.read_csv(
+        files["customers"],
+        usecols=["customer_id", "city", "customer_segment"],
+    )
+    cards = pd.read_csv(
+        files["cards"],
+        usecols=["customer_id", "card_id", "credit_limit", "current_outstanding",
+                 "card_status", "is_delinquent"],
+    )
+    accounts = pd.read_csv(
+        files["accounts"],
+        usecols=["account_type", "account_status", "current_balance"],
+    )
+
+    cards["is_delinquent"] = _bool(cards["is_delinquent"])
+    cards = cards.merge(customers, on="customer_id", how="left")
+    cards[["city", "customer_segment"]] = cards[["city", "customer_segment"]].fillna("unknown")
+
+    limit = cards["credit_limit"].where(cards["credit_limit"] > 0)
+    cards["utilization_band"] = pd.cut(
+        cards["current_outstanding"] / limit,
+        bins=UTILIZATION_BANDS, labels=UTILIZATION_LABELS, right=False,
+    ).astype(str)
+
+    views = {}
+
+    views["utilization_by_segment"] = (
+        cards.groupby(VIEW_KEYS["utilization_by_segment"])
+        .agg(cards=("card_id", "size"),
+             outstanding=("current_outstanding", "sum"),
+             credit_limit=("credit_limit", "sum"))
+        .reset_index()
+    )
+
+    delinquent = cards[cards["is_delinquent"]]
+    views["delinquent_by_card"] = (
+        cards.groupby(VIEW_KEYS["delinquent_by_card"])
+        .agg(cards=("customer_id", "size"))
+        .join(
+            delinquent.groupby(VIEW_KEYS["delinquent_by_card"])
+            .agg(delinquent_cards=("customer_id", "size"),
+                 # customer ids never repeat across batches
+                 delinquent_customers=("customer_id", "nunique"),
+                 delinquent_outstanding=("current_outstanding", "sum"))
+        )
+        .fillna(0)
+        .astype({"delinquent_cards": int, "delinquent_customers": int,
+                 "delinquent_outstanding": int})
+        .reset_index()
+    )
+
+    views["dormant_by_city"] = (
+        cards.assign(dormant=cards["card_status"].eq("dormant"))
+        .groupby(VIEW_KEYS["dormant_by_city"])
+        .agg(cards=("card_id", "size"), dormant_cards=("dormant", "sum"))
+        .astype(int)
+        .reset_index()
+    )
+
+    views["accounts_by_type"] = (
+        accounts.groupby(VIEW_KEYS["accounts_by_type"])
+        .agg(accounts=("current_balance", "size"), balance=("current_balance", "sum"))
+        .reset_index()
+    )
+
+    return {name: df.to_dict(orient="records") for name, df in views.items()}
+
+
+# ============================================================
+# 3. Combining + derived ratios
+# ============================================================
+def _derive(name, df, card_names):
+    if name == "utilization_by_segment":
+        seg_total = df.groupby("customer_segment")["cards"].transform("sum")
+        df["share"] = df["cards"] / seg_total
+    elif name == "delinquent_by_card":
+        df.insert(1, "card_name", df["card_id"].map(card_names).fillna(df["card_id"]))
+        df["delinquency_rate"] = df["delinquent_cards"] / df["cards"]
+    elif name == "dormant_by_city":
+        df["dormant_share"] = df["dormant_cards"] / df["cards"]
+    elif name == "accounts_by_type":
+        df["avg_balance"] = df["balance"] / df["accounts"]
+    return df
+
+
+def combine(partials, card_names=None):
+    """Sum per-batch partial aggregates into the served views."""
+    card_names = card_names or {}
+    combined = {}
+    for name, keys in VIEW_KEYS.items():
+        frames = [pd.DataFrame(p[name]) for p in partials if p.get(name)]
+        if not frames:
+            combined[name] = pd.DataFrame(columns=keys)
+            continue
+        df = pd.concat(frames, ignore_index=True).groupby(keys, as_index=False).sum()
+        combined[name] = _derive(name, df, card_names).sort_values(keys, ignore_index=True)
+    return combined
+
+
+# ============================================================
+# 4. Materialized views
+# ============================================================
+class PortfolioViews:
+    """
+    Group-by aggregates over customers x holdings, materialized once per
+    data batch and served from memory.
+
+    `refresh()` only re-aggregates batches whose files changed; the
+    partials are persisted to `cache_path` so a restart is a JSON load.
+    """
+
+    def __init__(self, data_root=None, card_metadata=None, cache_path=None, config_name="dev1"):
+        cfg = load_config(config_name)["analytics"]
+        self.data_root = Path(data_root or cfg["customer_data_root"])
+        self.card_metadata = Path(card_metadata or cfg["card_metadata"])
+        self.cache_path = Path(cache_path or cfg["cache_path"])
+
+        self.batches = {}    # batch name -> {"fingerprint": ..., "views": {...}}
+        self.card_names = {}
+        self.views = {}
+        self._index = {}
+
+        if self.cache_path.exists():
+            cache = json.loads(self.cache_path.read_text(encoding="utf-8"))
+            if cache.get("version") == CACHE_VERSION:
+                self.batches = cache["batches"]
+                self.card_names = load_card_names(self.card_metadata)
+                self._materialize()
+
+    # --------------------------------------
+    # Updating
+    # --------------------------------------
+    def refresh(self):
+        """Aggregate new or changed batches; returns the names re-aggregated."""
+        card_names = load_card_names(self.card_metadata)
+        renamed = card_names != self.card_names
+        self.card_names = card_names
+
+        found = discover_batches(self.data_root)
+        updated = []
+
+        for name, files in found.items():
+            fp = fingerprint(files)
+            if self.batches.get(name, {}).get("fingerprint") == fp:
+                continue
+            self.batches[name] = {"fingerprint": fp, "views": aggregate_batch(files)}
+            updated.append(name)
+
+        removed = [name for name in self.batches if name not in found]
+        for name in removed:
+            del self.batches[name]
+
+        if updated or removed:
+            self._materialize()
+            self._save()
+        elif renamed:
+            self._materialize()
+
+        return updated
+
+    def _materialize(self):
+        self.views = combine([b["views"] for b in self.batches.values()], self.card_names)
+        self._index = {
+            name: {
+                tuple(row[k] for k in VIEW_KEYS[name]): row
+                for row in df.to_dict(orient="records")
+            }
+            for name, df in self.views.items()
+        }
+
+    def _save(self):
+        write_atomic(
+            self.cache_path,
+            json.dumps({"version": CACHE_VERSION, "batches": self.batches},
+                       separators=(",", ":"), default=int),
+        )
+
+    # --------------------------------------
+    # Serving
+    # --------------------------------------
+    def get(self, name):
+        """Full view as a DataFrame."""
+        return self.views[name]
+
+    def lookup(self, name, *key):
+        """One row by its group key, e.g. lookup("dormant_by_city", "Mumbai")."""
+        return self._index[name].get(tuple(key))
+
+
+if __name__ == "__main__":
+    views = PortfolioViews()
+    print("Re-aggregated batches:", views.refresh() or "none")
+    for name in VIEW_KEYS:
+        print(f"\n{name}\n", views.get(name))
@@ -0,0 +1,34 @@
+import configparser
+import os
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+CONFIG_DIR = REPO_ROOT / "configs"
+
+
+def load_config(name="dev1"):
+    """Read configs/<name>.ini (e.g. "base", "dev1")."""
+    config = configparser.ConfigParser()
+    path = CONFIG_DIR / f"{name}.ini"
+    if not config.read(path, encoding="utf-8"):
+        raise FileNotFoundError(path)
+    return config
+
+
+def setting(section, value, key, cast):
+    """An explicit argument if one was given, else `key` from the config section."""
+    return value if value is not None else cast(section[key])
+
+
+def write_atomic(path, text):
+    """Write `text` via a temp file so readers never see a partial file."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def repo_path(path):
+    """Resolve a configured path against the repo root, not the working directory."""
+    return REPO_ROOT / path
@@ -0,0 +1,269 @@
+# utils/ingestion/dedup_sections.py
+
+import hashlib
+import json
+import re
+import zlib
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+
+# --------------------------------------------
+# DEFAULTS
+# 128 permutations split into 16 bands x 8 rows puts the LSH
+# S-curve threshold at ~0.71; candidates are then verified
+# against JACCARD_THRESHOLD on the full signature.
+# --------------------------------------------
+NUM_PERM = 128
+BANDS = 16
+SHINGLE_SIZE = 5
+JACCARD_THRESHOLD = 0.8
+
+MIN_CHUNK_WORDS = 80
+MAX_CHUNK_WORDS = 400
+BOUNDARY_DIVISOR = 4
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?;])\s+")
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+
+# ============================================================
+# 1. Chunking
+# Content-defined boundaries: a chunk is cut after a sentence whose
+# hash hits the divisor, so the same boilerplate paragraph is split
+# the same way in every booklet no matter where it starts.
+# ============================================================
+def split_sentences(text):
+    text = re.sub(r"\s+", " ", text or "").strip()
+    return [s for s in _SENTENCE_SPLIT.split(text) if s]
+
+
+def _bounded_pieces(sentences, max_words):
+    """Sentences as word lists; any longer than `max_words` split into windows."""
+    for sentence in sentences:
+        tokens = sentence.split()
+        for i in range(0, len(tokens), max_words):
+            yield tokens[i:i + max_words]
+
+
+def chunk_text(text, min_words=MIN_CHUNK_WORDS, max_words=MAX_CHUNK_WORDS,
+               divisor=BOUNDARY_DIVISOR):
+    """Chunks of whole sentences; no chunk exceeds `max_words` words."""
+    chunks = []
+    current = []
+
+    for piece in _bounded_pieces(split_sentences(text), max_words):
+        # close the chunk early rather than let this piece overflow it
+        if current and len(current) + len(piece) > max_words:
+            chunks.append(" ".join(current))
+            current = []
+
+        current.extend(piece)
+
+        at_boundary = zlib.crc32(" ".join(piece).lower().encode("utf-8")) % divisor == 0
+        if len(current) >= max_words or (len(current) >= min_words and at_boundary):
+            chunks.append(" ".join(current))
+            current = []
+
+    if current:
+        chunks.append(" ".join(current))
+
+    return chunks
+
+
+def chunk_product(data, **kwargs):
+    """Split every section of a parsed product JSON into chunk records."""
+    records = []
+    for doc in data["documents"]:
+        for section in doc.get("sections", []):
+            for i, text in enumerate(chunk_text(section.get("text", ""), **kwargs)):
+                records.append({
+                    "chunk_id": f"{section['section_id']}_{i}",
+                    "product_id": data["product_id"],
+                    "section_id": section["section_id"],
+                    "position": i,
+                    "text": text,
+                })
+    return records
+
+
+# ============================================================
+# 2. MinHash
+# ============================================================
+def shingle_hashes(text, k=SHINGLE_SIZE):
+    """32-bit hashes of the word k-grams in `text`."""
+    tokens = _TOKEN.findall(text.lower())
+    if len(tokens) < k:
+        grams = [" ".join(tokens)] if tokens else []
+    else:
+        grams = [" ".join(tokens[i:i + k]) for i in range(len(tokens) - k + 1)]
+
+    return np.fromiter(
+        {zlib.crc32(g.encode("utf-8")) for g in grams},
+        dtype=np.uint64,
+    )
+
+
+class MinHasher:
+
+    def __init__(self, num_perm=NUM_PERM, seed=1):
+        rng = np.random.RandomState(seed)
+        self.num_perm = num_perm
+        self.a = rng.randint(1, 1 << 32, size=num_perm, dtype=np.uint64)
+        self.b = rng.randint(0, 1 << 32, size=num_perm, dtype=np.uint64)
+
+    def signature(self, hashes):
+        if hashes.size == 0:
+            return np.full(self.num_perm, _MAX_HASH, dtype=np.uint64)
+        # (a * x + b) mod p stays inside uint64 because a, x < 2^32
+        phv = (np.outer(hashes, self.a) + self.b) % _MERSENNE_PRIME
+        return np.bitwise_and(phv, _MAX_HASH).min(axis=0)
+
+
+def estimate_jaccard(sig_a, sig_b):
+    return float(np.mean(sig_a == sig_b))
+
+
+# ============================================================
+# 3. LSH banding
+# ============================================================
+class LSHIndex:
+
+    def __init__(self, num_perm=NUM_PERM, bands=BANDS):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.buckets = [{} for _ in range(bands)]
+
+    def _bands(self, signature):
+        for i in range(self.bands):
+            yield i, signature[i * self.rows:(i + 1) * self.rows].tobytes()
+
+    def add(self, key, signature):
+        for i, band in self._bands(signature):
+            self.buckets[i].setdefault(band, []).append(key)
+
+    def query(self, signature):
+        """Every key sharing at least one band bucket with `signature`."""
+        candidates = set()
+        for i, band in self._bands(signature):
+            candidates.update(self.buckets[i].get(band, ()))
+        return candidates
+
+
+# ============================================================
+# 4. Dedup
+# ============================================================
+@dataclass
+class DedupReport:
+    total_chunks: int = 0
+    canonical_chunks: int = 0
+    total_chars: int = 0
+    stored_chars: int = 0
+    clusters: int = 0
+    cross_product_clusters: int = 0
+
+    @property
+    def duplicate_chunks(self):
+        return self.total_chunks - self.canonical_chunks
+
+    @property
+    def chars_saved(self):
+        return self.total_chars - self.stored_chars
+
+    @property
+    def embeddings_saved(self):
+        # one embedding per stored chunk
+        return self.duplicate_chunks
+
+    def summary(self):
+        pct = 100.0 * self.chars_saved / self.total_chars if self.total_chars else 0.0
+        return (
+            f"chunks: {self.total_chunks} → {self.canonical_chunks} "
+            f"({self.embeddings_saved} embeddings saved)\n"
+            f"chars:  {self.total_chars} → {self.stored_chars} ({pct:.1f}% saved)\n"
+            f"near-duplicate clusters: {self.clusters} "
+            f"({self.cross_product_clusters} span several products)"
+        )
+
+
+@dataclass
+class DedupResult:
+    canonical: dict = field(default_factory=dict)      # canonical chunk_id -> record
+    mapping: dict = field(default_factory=dict)        # chunk_id -> canonical chunk_id
+    products: dict = field(default_factory=dict)       # canonical chunk_id -> {product_id}
+    report: DedupReport = field(default_factory=DedupReport)
+
+
+def text_hash(text):
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def deduplicate(records, threshold=JACCARD_THRESHOLD, num_perm=NUM_PERM, bands=BANDS):
+    """
+    Collapse near-duplicate chunk records.
+
+    The first record seen in a cluster becomes canonical; later records
+    whose estimated Jaccard similarity to it reaches `threshold` are
+    mapped onto it instead of being stored again.
+    """
+    hasher = MinHasher(num_perm)
+    index = LSHIndex(num_perm, bands)
+    signatures = {}
+    result = DedupResult()
+    report = result.report
+
+    for rec in records:
+        key = rec["chunk_id"]
+        sig = hasher.signature(shingle_hashes(rec["text"]))
+        report.total_chunks += 1
+        report.total_chars += len(rec["text"])
+
+        match = None
+        best = threshold
+        for cand in index.query(sig):
+            score = estimate_jaccard(sig, signatures[cand])
+            if score >= best:
+                match, best = cand, score
+
+        if match is None:
+            index.add(key, sig)
+            signatures[key] = sig
+            result.canonical[key] = dict(rec, text_hash=text_hash(rec["text"]))
+            result.mapping[key] = key
+            result.products[key] = {rec["product_id"]}
+            report.stored_chars += len(rec["text"])
+        else:
+            result.mapping[key] = match
+            result.products[match].add(rec["product_id"])
+
+    report.canonical_chunks = len(result.canonical)
+
+    members = {}
+    for canon in result.mapping.values():
+        members[canon] = members.get(canon, 0) + 1
+    shared = [c for c, n in members.items() if n > 1]
+    report.clusters = len(shared)
+    report.cross_product_clusters = sum(1 for c in shared if len(result.products[c]) > 1)
+
+    return result
+
+
+def deduplicate_folders(*folders, **kwargs):
+    records = []
+    for folder in folders:
+        for f in sorted(Path(folder).iterdir()):
+            if f.suffix.lower() == ".json":
+                text = f.read_text(encoding="utf-8", errors="ignore")
+                records.extend(chunk_product(json.loads(text)))
+    return deduplicate(records, **kwargs), records
+
+
+if __name__ == "__main__":
+    result, _ = deduplicate_folders("parsed_json/parsed_creditcards", "parsed_json/Accounts")
+    print(result.report.summary())
@@ -0,0 +1,376 @@
+# utils/llm/client.py
+
+import asyncio
+import hashlib
+import random
+import re
+import time
+from collections import deque
+
+from utils.config import load_config, setting
+
+
+class RateLimitError(Exception):
+    """Provider throttled the request (HTTP 429 / RESOURCE_EXHAUSTED)."""
+
+
+class TransientError(Exception):
+    """Provider failed in a way worth retrying (HTTP 500 / 503 / 504)."""
+
+
+# ============================================================
+# 1. Rate limiting
+# ============================================================
+class TokenBucket:
+    """
+    Async token bucket: `rate` tokens per second, bursts up to `capacity`.
+    `clock` and `sleep` are injectable so tests can run on virtual time.
+    """
+
+    def __init__(self, rate, capacity=None, clock=time.monotonic, sleep=asyncio.sleep):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(rate, 1))
+        self.tokens = self.capacity
+        self.clock = clock
+        self.sleep = sleep
+        self.updated = clock()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, tokens=1):
+        async with self._lock:
+            while True:
+                self._refill()
+                # tolerance: float refill can stall just short of a whole token
+                if self.tokens >= tokens - 1e-9:
+                    self.tokens = max(self.tokens - tokens, 0.0)
+                    return
+                await self.sleep((tokens - self.tokens) / self.rate)
+
+
+# ============================================================
+# 2. Clients
+# Every client exposes `async generate(prompt) -> str`.
+# ============================================================
+class FakeLLMClient:
+    """
+    Deterministic local stand-in; records every prompt it receives.
+
+    `latency` is seconds per call, or a (low, high) range drawn from a
+    seeded RNG. `max_rps` makes it throttle like a real endpoint: calls
+    beyond that many within the last second raise RateLimitError.
+    """
+
+    def __init__(self, reply=None, latency=0.0, max_rps=None, supports_batch=False, seed=0):
+        self.reply = reply or (lambda prompt: f"[fake answer] {prompt.splitlines()[-1]}")
+        self.latency = latency
+        self.max_rps = max_rps
+        self.supports_batch = supports_batch
+        self.rng = random.Random(seed)
+        self.calls = []
+        self.batches = []
+        self.throttled = 0
+        self._recent = deque()
+
+    def _check_rate(self):
+        if self.max_rps is None:
+            return
+        now = time.monotonic()
+        while self._recent and now - self._recent[0] >= 1.0:
+            self._recent.popleft()
+        if len(self._recent) >= self.max_rps:
+            self.throttled += 1
+            raise RateLimitError("fake provider: quota exceeded")
+        self._recent.append(now)
+
+    async def _wait(self):
+        delay = self.latency
+        if isinstance(delay, tuple):
+            delay = self.rng.uniform(*delay)
+        if delay:
+            await asyncio.sleep(delay)
+
+    async def generate(self, prompt):
+        self._check_rate()
+        self.calls.append(prompt)
+        await self._wait()
+        return self.reply(prompt)
+
+    async def generate_batch(self, prompts):
+        self._check_rate()
+        self.batches.append(list(prompts))
+        self.calls.extend(prompts)
+        await self._wait()
+        return [self.reply(p) for p in prompts]
+
+
+class VertexLLMClient:
+    """Gemini on Vertex AI, configured from the [llm] and [auth] sections."""
+
+    # online generate_content has no multi-prompt call
+    supports_batch = False
+
+    def __init__(self, config_name="dev1"):
+        # imported lazily so the rest of the package works without the SDK
+        import vertexai
+        from google.oauth2 import service_account
+        from vertexai.generative_models import GenerationConfig, GenerativeModel
+
+        config = load_config(config_name)
+        llm = config["llm"]
+
+        credentials = service_account.Credentials.from_service_account_file(
+            config["auth"]["gcp_credentials_path"]
+        )
+        vertexai.init(project=llm["project"], location=llm["region"], credentials=credentials)
+
+        self.model_name = llm["model_name"]
+        self.model = GenerativeModel(self.model_name)
+        self.generation_config = GenerationConfig(
+            temperature=llm.getfloat("temperature"),
+            top_p=llm.getfloat("top_p"),
+            top_k=llm.getint("top_k"),
+            # max_tokens is the context size; the reply has its own, smaller cap
+            max_output_tokens=llm.getint("max_output_tokens", fallback=None),
+        )
+
+    async def generate(self, prompt):
+        from google.api_core.exceptions import (
+            DeadlineExceeded, InternalServerError, ResourceExhausted, ServiceUnavailable,
+        )
+
+        try:
+            response = await self.model.generate_content_async(
+                prompt, generation_config=self.generation_config
+            )
+        except ResourceExhausted as e:
+            raise RateLimitError(str(e)) from e
+        except (ServiceUnavailable, DeadlineExceeded, InternalServerError) as e:
+            raise TransientError(str(e)) from e
+        return response.text
+
+
+# ============================================================
+# 3. Micro-batching
+# Requests arriving within `window` seconds are sent as one provider
+# call (up to `max_size` prompts) when the provider supports it.
+# ============================================================
+class _MicroBatcher:
+
+    def __init__(self, send_batch, max_size, window):
+        # send_batch(prompts, on_start) calls on_start() once the batch
+        # leaves the queue and the provider call begins
+        self.send_batch = send_batch
+        self.max_size = max_size
+        self.window = window
+        self.pending = []
+        self._timer = None
+        self._tasks = set()    # strong refs so running batches aren't collected
+
+    async def submit(self, prompt, started=None):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.pending.append((prompt, future, started))
+
+        if len(self.pending) >= self.max_size:
+            self._dispatch()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._dispatch)
+
+        return await future
+
+    def _dispatch(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self.pending = self.pending, []
+        if batch:
+            task = asyncio.ensure_future(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch):
+        def on_start():
+            for _, _, started in batch:
+                if started is not None:
+                    started.set()
+
+        try:
+            results = await self.send_batch([p for p, _, _ in batch], on_start)
+        except Exception as e:
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for i, (_, future, _) in enumerate(batch):
+            if future.done():
+                continue
+            if i < len(results):
+                future.set_result(results[i])
+            else:
+                future.set_exception(RuntimeError(
+                    f"provider returned {len(results)} results for {len(batch)} prompts"
+                ))
+
+
+# ============================================================
+# 4. Resilient client
+# ============================================================
+_WHITESPACE = re.compile(r"\s+")
+
+
+def prompt_key(prompt):
+    """Prompts differing only in case or whitespace share one call."""
+    normalized = _WHITESPACE.sub(" ", prompt).strip().lower()
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+class ResilientLLMClient:
+    """
+    Wraps any provider client with, in order of application:
+
+    - single-flight: identical in-flight prompts share one call
+    - retries with exponential backoff on throttling, timeouts and
+      transient provider errors
+    - hedging: a duplicate request if the first is slow, first answer wins
+    - bounded concurrency and a token-bucket rate limit per provider call
+    - micro-batching when the provider exposes `generate_batch`
+
+    Unset arguments come from the [llm_client] config section.
+    """
+
+    def __init__(self, provider, requests_per_second=None, burst=None,
+                 max_concurrency=None, timeout=None, hedge_after=None,
+                 max_attempts=None, backoff=None, batch_size=None,
+                 batch_window=None, config_name="dev1"):
+        cfg = load_config(config_name)["llm_client"]
+
+        self.provider = provider
+        self.limiter = TokenBucket(
+            setting(cfg, requests_per_second, "requests_per_second", float),
+            setting(cfg, burst, "burst", float),
+        )
+        self.semaphore = asyncio.Semaphore(setting(cfg, max_concurrency, "max_concurrency", int))
+        self.timeout = setting(cfg, timeout, "timeout_seconds", float)
+        self.hedge_after = setting(cfg, hedge_after, "hedge_after_seconds", float)
+        self.max_attempts = setting(cfg, max_attempts, "max_attempts", int)
+        self.backoff = setting(cfg, backoff, "backoff_seconds", float)
+
+        self.batcher = None
+        batch_size = setting(cfg, batch_size, "batch_size", int)
+        if batch_size > 1 and getattr(provider, "supports_batch", False):
+            self.batcher = _MicroBatcher(
+                self._send_batch, batch_size,
+                setting(cfg, batch_window, "batch_window_seconds", float),
+            )
+
+        self._inflight = {}
+        self.stats = {
+            "requests": 0, "coalesced": 0, "provider_calls": 0, "batches": 0,
+            "hedges": 0, "retries": 0, "throttled": 0, "timeouts": 0, "transient": 0,
+        }
+
+    # --------------------------------------
+    # Public API
+    # --------------------------------------
+    async def generate(self, prompt):
+        self.stats["requests"] += 1
+        key = prompt_key(prompt)
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._with_retries(prompt))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            self.stats["coalesced"] += 1
+
+        # shield: one caller giving up must not cancel the shared call
+        return await asyncio.shield(task)
+
+    # --------------------------------------
+    # Retries
+    # --------------------------------------
+    async def _with_retries(self, prompt):
+        for attempt in range(self.max_attempts):
+            try:
+                return await self._hedged(prompt)
+            except (RateLimitError, TransientError, TimeoutError) as e:
+                if isinstance(e, RateLimitError):
+                    self.stats["throttled"] += 1
+                elif isinstance(e, TransientError):
+                    self.stats["transient"] += 1
+                else:
+                    self.stats["timeouts"] += 1
+                if attempt == self.max_attempts - 1:
+                    raise
+                self.stats["retries"] += 1
+                delay = self.backoff * (2 ** attempt)
+                await asyncio.sleep(delay * random.uniform(0.5, 1.5))
+
+    # --------------------------------------
+    # Hedging
+    # --------------------------------------
+    async def _hedged(self, prompt):
+        started = asyncio.Event()
+        tasks = {asyncio.ensure_future(self._send(prompt, started))}
+        hedged = not self.hedge_after
+        error = None
+
+        try:
+            if not hedged:
+                # the hedge clock starts once the call leaves the queue
+                waiter = asyncio.ensure_future(started.wait())
+                await asyncio.wait(tasks | {waiter}, return_when=asyncio.FIRST_COMPLETED)
+                waiter.cancel()
+
+            while tasks:
+                done, tasks = await asyncio.wait(
+                    tasks,
+                    timeout=None if hedged else self.hedge_after,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                for t in done:
+                    if t.exception() is None:
+                        return t.result()
+                    error = t.exception()
+
+                if not done and not hedged:
+                    hedged = True
+                    self.stats["hedges"] += 1
+                    tasks.add(asyncio.ensure_future(self._send(prompt)))
+        finally:
+            for t in tasks:
+                t.cancel()
+
+        raise error
+
+    # --------------------------------------
+    # Provider calls — the timeout covers the call itself, not the
+    # time spent waiting for a concurrency slot or rate token
+    # --------------------------------------
+    async def _send(self, prompt, started=None):
+        if self.batcher is not None:
+            # the batch call carries the timeout; the wait here is queueing
+            return await self.batcher.submit(prompt, started)
+
+        async with self.semaphore:
+            await self.limiter.acquire()
+            if started is not None:
+                started.set()
+            self.stats["provider_calls"] += 1
+            return await asyncio.wait_for(self.provider.generate(prompt), self.timeout)
+
+    async def _send_batch(self, prompts, on_start=None):
+        async with self.semaphore:
+            await self.limiter.acquire()
+            if on_start is not None:
+                on_start()
+            self.stats["provider_calls"] += 1
+            self.stats["batches"] += 1
+            return await asyncio.wait_for(self.provider.generate_batch(prompts), self.timeout)
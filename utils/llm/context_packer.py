@@ -0,0 +1,238 @@
+# utils/llm/context_packer.py
+
+import json
+import re
+from dataclasses import dataclass, field
+
+from utils.config import load_config
+from utils.ingestion.dedup_sections import split_sentences
+
+# --------------------------------------------
+# PROFILE FIELDS WORTH SPENDING TOKENS ON
+# (customers_*.csv columns; contact details and PAN are left out)
+# --------------------------------------------
+PROFILE_FIELDS = [
+    "customer_id", "city", "annual_income", "occupation", "kyc_status",
+    "customer_segment", "credit_score", "is_hni", "is_delinquent",
+]
+
+BLOCK_SEP = "\n\n"
+LINE_SEP = "\n"
+
+_PIECE = re.compile(r"\w+|[^\w\s]")
+_NORMALIZE = re.compile(r"[^a-z0-9]+")
+
+
+# ============================================================
+# 1. Token estimate
+# Roughly one token per short word or punctuation mark, plus one per
+# extra 4 characters of longer words — close enough to SentencePiece
+# counts for budgeting without loading a tokenizer.
+# ============================================================
+def estimate_tokens(text):
+    return sum(1 + (len(p) - 1) // 4 for p in _PIECE.findall(text or ""))
+
+
+def _sentence_key(sentence):
+    return _NORMALIZE.sub(" ", sentence.lower()).strip()
+
+
+# ============================================================
+# 2. Renderers — compact text for structured inputs
+# ============================================================
+def render_profile(profile):
+    if not profile:
+        return ""
+    parts = [f"{k}: {profile[k]}" for k in PROFILE_FIELDS if profile.get(k) not in (None, "")]
+    return "; ".join(parts)
+
+
+def render_rows(rows):
+    """Pipe table with a single header line."""
+    if not rows:
+        return ""
+    headers = list(rows[0].keys())
+    lines = [" | ".join(headers)]
+    for row in rows:
+        lines.append(" | ".join(str(row.get(h, "")) for h in headers))
+    return "\n".join(lines)
+
+
+def render_structured(structured):
+    """Non-empty structured fields only, as compact JSON."""
+    def prune(value):
+        if isinstance(value, dict):
+            value = {k: prune(v) for k, v in value.items()}
+            return {k: v for k, v in value.items() if v not in ("", [], {}, None)}
+        return value
+
+    kept = prune(structured or {})
+    return json.dumps(kept, ensure_ascii=False, separators=(",", ":")) if kept else ""
+
+
+def _raw_section_text(section):
+    parts = [section.get("title", ""), section.get("text", "")]
+    parts += [json.dumps(t.get("json"), ensure_ascii=False) for t in section.get("tables", [])]
+    if section.get("structured"):
+        parts.append(json.dumps(section["structured"], ensure_ascii=False))
+    return "\n".join(parts)
+
+
+# ============================================================
+# 3. Packer
+# ============================================================
+@dataclass
+class PackedContext:
+    prompt: str
+    tokens: int
+    raw_tokens: int
+    budget: int
+    sections_used: list = field(default_factory=list)
+    sentences_kept: int = 0
+    sentences_duplicate: int = 0
+    sentences_over_budget: int = 0
+
+    @property
+    def tokens_saved(self):
+        return max(self.raw_tokens - self.tokens, 0)
+
+
+class ContextPacker:
+    """
+    Build an LLM prompt from ranked sections, a customer profile and
+    fact-table rows without exceeding a token budget.
+
+    Order of spend: question, profile, fact rows, then sections in rank
+    order — each section's structured fields and tables before its text,
+    and its text sentence by sentence with repeats dropped. No single
+    section may take more than `max_section_share` of the budget.
+    """
+
+    def __init__(self, token_budget=None, max_section_share=None,
+                 count_tokens=estimate_tokens, config_name="dev1"):
+        if token_budget is None or max_section_share is None:
+            ctx = load_config(config_name)["context"]
+            token_budget = token_budget or ctx.getint("token_budget")
+            max_section_share = max_section_share or ctx.getfloat("max_section_share")
+
+        self.token_budget = token_budget
+        self.max_section_share = max_section_share
+        self.count_tokens = count_tokens
+        self.log = []    # (request_id, prompt tokens, raw tokens) per pack()
+
+    def pack(self, question, sections, profile=None, fact_rows=None, request_id=None):
+        # the question always goes in, after the context it refers to
+        question_block = f"## Question\n{question}"
+        blocks = []
+        used = self.count_tokens(question_block)
+        if used > self.token_budget:
+            raise ValueError(
+                f"question alone needs {used} tokens, over the budget of {self.token_budget}"
+            )
+        stats = {"kept": 0, "duplicate": 0, "over_budget": 0}
+
+        # costs include the separators the pieces are joined with, so
+        # counters that see whitespace stay within the budget too
+        def add(block):
+            nonlocal used
+            cost = self.count_tokens(block + BLOCK_SEP)
+            if used + cost > self.token_budget:
+                return False
+            blocks.append(block)
+            used += cost
+            return True
+
+        profile_text = render_profile(profile)
+        if profile_text:
+            add(f"## Customer\n{profile_text}")
+
+        for name, rows in (fact_rows or {}).items():
+            table = render_rows(rows)
+            if table:
+                add(f"## {name}\n{table}")
+
+        seen = set()
+        section_cap = int(self.token_budget * self.max_section_share)
+        sections_used = []
+
+        for section in sections:
+            if used >= self.token_budget:
+                break
+
+            header = f"### {section.get('product_id', '')} — {section.get('title', '')}".strip()
+            body = []
+            spent = self.count_tokens(header + BLOCK_SEP)
+
+            def take(piece):
+                nonlocal spent
+                cost = self.count_tokens(LINE_SEP + piece)
+                if spent + cost > section_cap or used + spent + cost > self.token_budget:
+                    return False
+                body.append(piece)
+                spent += cost
+                return True
+
+            structured = render_structured(section.get("structured"))
+            if structured:
+                take(f"structured: {structured}")
+
+            for table in section.get("tables", []):
+                rows = table.get("json") or []
+                if rows:
+                    take(render_rows(rows))
+
+            sentences = split_sentences(section.get("text", ""))
+            for i, sentence in enumerate(sentences):
+                key = _sentence_key(sentence)
+                if not key:
+                    continue
+                if key in seen:
+                    stats["duplicate"] += 1
+                    continue
+                if not take(sentence):
+                    # text is in reading order; stop at the first overflow
+                    stats["over_budget"] += len(sentences) - i
+                    break
+                seen.add(key)
+                stats["kept"] += 1
+
+            if body:
+                blocks.append(LINE_SEP.join([header] + body))
+                used += spent
+                sections_used.append(section.get("section_id"))
+
+        prompt = BLOCK_SEP.join(blocks + [question_block])
+
+        raw = "\n\n".join(
+            [question, json.dumps(profile or {}, ensure_ascii=False),
+             json.dumps(fact_rows or {}, ensure_ascii=False)]
+            + [_raw_section_text(s) for s in sections]
+        )
+
+        packed = PackedContext(
+            prompt=prompt,
+            tokens=self.count_tokens(prompt),
+            raw_tokens=self.count_tokens(raw),
+            budget=self.token_budget,
+            sections_used=sections_used,
+            sentences_kept=stats["kept"],
+            sentences_duplicate=stats["duplicate"],
+            sentences_over_budget=stats["over_budget"],
+        )
+        self.log.append((request_id, packed.tokens, packed.raw_tokens))
+        return packed
+
+    def token_report(self):
+        """Prompt vs. unpacked tokens over every request packed so far."""
+        if not self.log:
+            return {"requests": 0, "prompt_tokens": 0, "raw_tokens": 0, "reduction": 0.0}
+        prompt = sum(t for _, t, _ in self.log)
+        raw = sum(r for _, _, r in self.log)
+        return {
+            "requests": len(self.log),
+            "prompt_tokens": prompt,
+            "raw_tokens": raw,
+            "mean_prompt_tokens": prompt / len(self.log),
+            "max_prompt_tokens": max(t for _, t, _ in self.log),
+            "reduction": 1 - prompt / raw if raw else 0.0,
+        }
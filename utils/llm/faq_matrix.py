@@ -0,0 +1,218 @@
+# utils/llm/faq_matrix.py
+
+import asyncio
+import hashlib
+import json
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+
+from utils.config import load_config, repo_path, write_atomic
+from utils.llm.client import TokenBucket
+from utils.llm.context_packer import ContextPacker
+from utils.parsers.canonical_topics import CANONICAL_ORDER, CANONICAL_TOPICS
+
+# Bump when the prompt changes so every cell is regenerated
+PROMPT_VERSION = "1"
+
+TOPICS = {
+    "Account": CANONICAL_TOPICS,
+    "CreditCard": CANONICAL_ORDER,
+}
+
+QUESTION_TEMPLATE = (
+    "Using only the product information above, summarise the {topic} of "
+    "{product_name} for a customer in at most five sentences. If the "
+    "information does not cover it, say so."
+)
+
+
+def cell_key(product_id, topic):
+    return f"{product_id}::{topic.lower()}"
+
+
+def content_hash(sections):
+    payload = json.dumps(
+        [
+            [s.get("title", ""), s.get("text", ""),
+             [t.get("json") for t in s.get("tables", [])], s.get("structured", {})]
+            for s in sections
+        ],
+        ensure_ascii=False,
+        sort_keys=True,
+    )
+    return hashlib.sha256(f"{PROMPT_VERSION}\n{payload}".encode("utf-8")).hexdigest()
+
+
+def _has_content(section):
+    return bool(section.get("text", "").strip() or section.get("tables") or section.get("structured"))
+
+
+# ============================================================
+# 1. Store — one JSON file, O(1) lookups by (product, topic)
+# ============================================================
+class FAQStore:
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.cells = {}
+        if self.path.exists():
+            self.cells = json.loads(self.path.read_text(encoding="utf-8"))["cells"]
+
+    def get(self, product_id, topic):
+        return self.cells.get(cell_key(product_id, topic))
+
+    def answer(self, product_id, topic):
+        cell = self.get(product_id, topic)
+        return cell["answer"] if cell and not cell.get("stale") else None
+
+    def put(self, cell):
+        self.cells[cell_key(cell["product_id"], cell["topic"])] = cell
+
+    def mark_stale(self, product_id, topic):
+        """The source text changed but no new answer exists: stop serving the old one."""
+        cell = self.get(product_id, topic)
+        if cell:
+            cell["stale"] = True
+
+    def save(self):
+        write_atomic(
+            self.path,
+            json.dumps({"prompt_version": PROMPT_VERSION, "cells": self.cells},
+                       indent=2, ensure_ascii=False),
+        )
+
+
+# ============================================================
+# 2. Batch builder
+# ============================================================
+@dataclass
+class BuildReport:
+    generated: list = field(default_factory=list)
+    unchanged: list = field(default_factory=list)
+    not_covered: list = field(default_factory=list)
+    failed: dict = field(default_factory=dict)
+
+    def summary(self):
+        return (
+            f"generated: {len(self.generated)}, unchanged: {len(self.unchanged)}, "
+            f"not covered: {len(self.not_covered)}, failed: {len(self.failed)}"
+        )
+
+
+class FAQMatrixBuilder:
+    """
+    Precompute a grounded answer for every product x canonical topic cell.
+
+    Cells whose section content hash matches the stored one are skipped,
+    so re-running after a re-parse only calls the LLM for changed cells.
+    """
+
+    def __init__(self, client, store=None, max_concurrency=None,
+                 requests_per_second=None, packer=None, config_name="dev1"):
+        faq = load_config(config_name)["faq"]
+
+        self.client = client
+        self.store = store or FAQStore(repo_path(faq["store_path"]))
+        self.max_concurrency = max_concurrency or faq.getint("max_concurrency")
+        self.requests_per_second = requests_per_second or faq.getfloat("requests_per_second")
+        self.packer = packer or ContextPacker(config_name=config_name)
+
+    def cells(self, data):
+        """Every (topic, sections) cell for one parsed product JSON."""
+        sections = [s for doc in data["documents"] for s in doc.get("sections", [])]
+        for topic in TOPICS[data["product_line"]]:
+            matching = [
+                dict(s, product_id=data["product_id"])
+                for s in sections
+                if s.get("type") == topic and _has_content(s)
+            ]
+            yield topic, matching
+
+    async def _generate(self, data, topic, sections, digest, semaphore, limiter, report):
+        key = cell_key(data["product_id"], topic)
+        question = QUESTION_TEMPLATE.format(topic=topic, product_name=data["product_name"])
+        packed = self.packer.pack(question, sections, request_id=key)
+
+        async with semaphore:
+            await limiter.acquire()
+            try:
+                answer = await self.client.generate(packed.prompt)
+            except Exception as e:
+                report.failed[key] = repr(e)
+                return
+
+        self.store.put({
+            "product_id": data["product_id"],
+            "topic": topic,
+            "content_hash": digest,
+            "answer": answer,
+            "section_ids": [s["section_id"] for s in sections],
+            "prompt_tokens": packed.tokens,
+            "generated_at": datetime.now().isoformat(),
+        })
+        report.generated.append(key)
+
+    async def build(self, products):
+        report = BuildReport()
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        limiter = TokenBucket(self.requests_per_second)
+        jobs = []
+
+        for data in products:
+            for topic, sections in self.cells(data):
+                key = cell_key(data["product_id"], topic)
+                digest = content_hash(sections)
+                stored = self.store.get(data["product_id"], topic)
+
+                if stored and stored["content_hash"] == digest:
+                    report.unchanged.append(key)
+                elif not sections:
+                    self.store.put({
+                        "product_id": data["product_id"],
+                        "topic": topic,
+                        "content_hash": digest,
+                        "answer": None,
+                        "section_ids": [],
+                        "prompt_tokens": 0,
+                        "generated_at": datetime.now().isoformat(),
+                    })
+                    report.not_covered.append(key)
+                else:
+                    jobs.append((data["product_id"], topic, self._generate(
+                        data, topic, sections, digest, semaphore, limiter, report
+                    )))
+
+        # save whatever was generated even if a job or the run itself fails
+        try:
+            results = await asyncio.gather(*(job for _, _, job in jobs), return_exceptions=True)
+            for (product_id, topic, _), result in zip(jobs, results):
+                if isinstance(result, BaseException):
+                    report.failed.setdefault(cell_key(product_id, topic), repr(result))
+        finally:
+            # a changed cell that failed keeps its old hash, so the next
+            # run retries it; until then its old answer is not served
+            for product_id, topic, _ in jobs:
+                if cell_key(product_id, topic) in report.failed:
+                    self.store.mark_stale(product_id, topic)
+            self.store.save()
+        return report
+
+    def run(self, *folders):
+        products = []
+        for folder in folders:
+            for f in sorted(Path(folder).iterdir()):
+                if f.suffix.lower() == ".json":
+                    products.append(json.loads(f.read_text(encoding="utf-8", errors="ignore")))
+
+        report = asyncio.run(self.build(products))
+        print(report.summary())
+        return report
+
+
+if __name__ == "__main__":
+    from utils.llm.client import ResilientLLMClient, VertexLLMClient
+
+    FAQMatrixBuilder(ResilientLLMClient(VertexLLMClient())).run(
+        repo_path("parsed_json/Accounts"), repo_path("parsed_json/parsed_creditcards")
+    )
@@ -0,0 +1,46 @@
+# Shared by the parsers and everything keyed on section type
+
+# --------------------------------------------
+# FINAL LOCKED CANONICAL TOPICS (FOR ACCOUNTS)
+# --------------------------------------------
+CANONICAL_TOPICS = [
+    "Product Overview",
+    "Features & Benefits",
+    "Eligibility",
+    "KYC / Documentation",
+    "Fees & Charges",
+    "Interest / Pricing",
+    "Eligibility Addendum",
+    "MITC",
+    "Transaction & Usage Rules",
+    "Limits",
+    "Instruments & Tools",
+    "Statements & Communication",
+    "Dormancy / Inoperative / Surrender",
+    "Closure",
+    "Complaints & Grievances",
+    "Legal T&C"
+]
+
+
+# --------------------------------------------
+# CANONICAL CREDIT CARD STRUCTURE
+# --------------------------------------------
+CANONICAL_TYPES = {
+    "features": ["exclusive features", "key features", "benefits"],
+    "rewards": ["rewards", "cashback", "reward points", "rewards structure"],
+    "billing": ["billing", "payment", "minimum amount due", "statement"],
+    "fees": ["fees", "charges", "mitc"],
+    "emi_flexipay": ["flexipay", "emi"],
+    "balance_transfer": ["balance transfer"],
+    "insurance": ["insurance", "coverage"],
+    "terms_and_conditions": ["terms", "conditions", "agreement"],
+    "disputes": ["dispute", "grievance", "chargeback"]
+}
+
+# Ordered for clean flow
+CANONICAL_ORDER = [
+    "features", "rewards", "billing", "fees",
+    "emi_flexipay", "balance_transfer",
+    "insurance", "terms_and_conditions", "disputes"
+]
@@ -6,27 +6,7 @@ from datetime import datetime
 from pathlib import Path
 from docx import Document
 
-# --------------------------------------------
-# FINAL LOCKED CANONICAL TOPICS (FOR ACCOUNTS)
-# --------------------------------------------
-CANONICAL_TOPICS = [
-    "Product Overview",
-    "Features & Benefits",
-    "Eligibility",
-    "KYC / Documentation",
-    "Fees & Charges",
-    "Interest / Pricing",
-    "Eligibility Addendum",
-    "MITC",
-    "Transaction & Usage Rules",
-    "Limits",
-    "Instruments & Tools",
-    "Statements & Communication",
-    "Dormancy / Inoperative / Surrender",
-    "Closure",
-    "Complaints & Grievances",
-    "Legal T&C"
-]
+from utils.parsers.canonical_topics import CANONICAL_TOPICS
 
 # --------------------------------------------
 # STRONGER NORMALIZATION RULES
@@ -9,28 +9,7 @@ from pathlib import Path
 from datetime import datetime
 from dateutil.tz import gettz
 
-# ============================================================
-# 1. CANONICAL CREDIT CARD STRUCTURE
-# ============================================================
-
-CANONICAL_TYPES = {
-    "features": ["exclusive features", "key features", "benefits"],
-    "rewards": ["rewards", "cashback", "reward points", "rewards structure"],
-    "billing": ["billing", "payment", "minimum amount due", "statement"],
-    "fees": ["fees", "charges", "mitc"],
-    "emi_flexipay": ["flexipay", "emi"],
-    "balance_transfer": ["balance transfer"],
-    "insurance": ["insurance", "coverage"],
-    "terms_and_conditions": ["terms", "conditions", "agreement"],
-    "disputes": ["dispute", "grievance", "chargeback"]
-}
-
-# Ordered for clean flow
-CANONICAL_ORDER = [
-    "features", "rewards", "billing", "fees",
-    "emi_flexipay", "balance_transfer",
-    "insurance", "terms_and_conditions", "disputes"
-]
+from utils.parsers.canonical_topics import CANONICAL_TYPES, CANONICAL_ORDER
 
 
 # ============================================================
@@ -0,0 +1,330 @@
+# utils/sessions/session_store.py
+
+import hashlib
+import json
+import os
+import sys
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+from utils.config import load_config, setting, write_atomic
+
+# Rough per-object overheads used for the memory cap (CPython, 64-bit)
+_SESSION_OVERHEAD = 160
+_TURN_OVERHEAD = 96
+_REF_OVERHEAD = 8       # one pointer per interned section id
+
+
+# ============================================================
+# 1. Compact records
+# ============================================================
+class Turn:
+    __slots__ = ("role", "text", "section_ids", "ts", "nbytes")
+
+    def __init__(self, role, text, section_ids=(), ts=0.0):
+        self.role = role
+        self.text = text
+        # interned: every session referencing a section shares one string
+        self.section_ids = tuple(sys.intern(s) for s in section_ids)
+        self.ts = ts
+        self.nbytes = _TURN_OVERHEAD + len(self.text) + _REF_OVERHEAD * len(self.section_ids)
+
+    def to_dict(self):
+        return {"role": self.role, "text": self.text,
+                "section_ids": list(self.section_ids), "ts": self.ts}
+
+
+class Session:
+    __slots__ = ("session_id", "customer_id", "product_scope", "turns",
+                 "summary", "created", "last_access", "nbytes")
+
+    def __init__(self, session_id, customer_id=None, product_scope=(), now=0.0):
+        self.session_id = session_id
+        self.customer_id = customer_id
+        self.product_scope = tuple(sys.intern(p) for p in product_scope)
+        self.turns = []
+        self.summary = ""
+        self.created = now
+        self.last_access = now
+        self.nbytes = 0
+        self._measure()
+
+    def _measure(self):
+        self.nbytes = (
+            _SESSION_OVERHEAD + len(self.summary)
+            + _REF_OVERHEAD * len(self.product_scope)
+            + sum(t.nbytes for t in self.turns)
+        )
+
+    @property
+    def section_ids(self):
+        """Sections retrieved in the recent turns, most recent first, no repeats."""
+        seen = {}
+        for turn in reversed(self.turns):
+            for sid in turn.section_ids:
+                seen.setdefault(sid, None)
+        return tuple(seen)
+
+    def to_dict(self):
+        return {
+            "session_id": self.session_id,
+            "customer_id": self.customer_id,
+            "product_scope": list(self.product_scope),
+            "turns": [t.to_dict() for t in self.turns],
+            "summary": self.summary,
+            "created": self.created,
+            "last_access": self.last_access,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        session = cls(data["session_id"], data["customer_id"], data["product_scope"], data["created"])
+        session.turns = [Turn(**t) for t in data["turns"]]
+        session.summary = data["summary"]
+        session.last_access = data["last_access"]
+        session._measure()
+        return session
+
+
+def truncate_summary(summary, turns, max_chars):
+    """
+    Default summariser: fold old turns into a one-line-per-turn digest of
+    the user's questions, keeping the most recent `max_chars`.
+    """
+    lines = [summary] if summary else []
+    for t in turns:
+        if t.role == "user":
+            lines.append(t.text.split("\n")[0][:120])
+    digest = " | ".join(lines)
+    return digest[-max_chars:]
+
+
+# ============================================================
+# 2. Store
+# ============================================================
+class SessionStore:
+    """
+    In-memory conversation state with LRU + TTL eviction.
+
+    Sessions keep the last `max_turns` turns verbatim; older turns are
+    folded into `summary` by `summarize(summary, old_turns, max_chars)`.
+    When either `max_sessions` or `max_bytes` is exceeded the least
+    recently used session is evicted — to `spill_dir` if one is set, from
+    where a later lookup reloads it. Sessions idle longer than `ttl`
+    seconds are dropped from both tiers.
+    """
+
+    def __init__(self, max_sessions=None, max_bytes=None, ttl=None, max_turns=None,
+                 max_summary_chars=None, spill_dir=None, summarize=truncate_summary,
+                 clock=time.time, config_name="dev1"):
+        cfg = load_config(config_name)["sessions"]
+
+        self.max_sessions = setting(cfg, max_sessions, "max_sessions", int)
+        self.max_bytes = setting(cfg, max_bytes, "max_bytes", int)
+        self.ttl = setting(cfg, ttl, "ttl_seconds", float)
+        self.max_turns = setting(cfg, max_turns, "max_turns", int)
+        self.max_summary_chars = setting(cfg, max_summary_chars, "max_summary_chars", int)
+        spill_dir = spill_dir if spill_dir is not None else cfg.get("spill_dir", "")
+        self.spill_dir = Path(spill_dir) if spill_dir else None
+        self.summarize = summarize
+        self.clock = clock
+
+        self._sessions = OrderedDict()
+        self.bytes = 0
+        self.stats = {"hits": 0, "misses": 0, "spilled": 0, "reloaded": 0, "expired": 0}
+
+        if self.spill_dir:
+            self.spill_dir.mkdir(parents=True, exist_ok=True)
+
+    def __len__(self):
+        return len(self._sessions)
+
+    # --------------------------------------
+    # Lookup
+    # --------------------------------------
+    def get(self, session_id):
+        now = self.clock()
+        session = self._sessions.get(session_id)
+
+        if session is not None:
+            if now - session.last_access > self.ttl:
+                self._drop(session_id)
+                self.stats["expired"] += 1
+                session = None
+            else:
+                self._sessions.move_to_end(session_id)
+        elif self.spill_dir:
+            session = self._reload(session_id, now)
+
+        if session is None:
+            self.stats["misses"] += 1
+            return None
+
+        self.stats["hits"] += 1
+        session.last_access = now
+        return session
+
+    def get_or_create(self, session_id, customer_id=None, product_scope=()):
+        session = self.get(session_id)
+        if session is None:
+            session = Session(session_id, customer_id, product_scope, self.clock())
+            self._sessions[session_id] = session
+            self.bytes += session.nbytes
+            self._enforce_cap()
+        return session
+
+    # --------------------------------------
+    # Updates
+    # --------------------------------------
+    def add_turn(self, session_id, role, text, section_ids=(), product_scope=None):
+        session = self.get_or_create(session_id)
+        before = session.nbytes
+
+        session.turns.append(Turn(role, text, section_ids, self.clock()))
+        if product_scope is not None:
+            session.product_scope = tuple(sys.intern(p) for p in product_scope)
+
+        if len(session.turns) > self.max_turns:
+            old = session.turns[:-self.max_turns]
+            session.turns = session.turns[-self.max_turns:]
+            session.summary = self.summarize(session.summary, old, self.max_summary_chars)
+
+        session._measure()
+        self.bytes += session.nbytes - before
+        self._enforce_cap()
+        return session
+
+    def context(self, session_id):
+        """What the next turn needs: scope, digest, recent turns, section refs."""
+        session = self.get(session_id)
+        if session is None:
+            return None
+        return {
+            "customer_id": session.customer_id,
+            "product_scope": session.product_scope,
+            "summary": session.summary,
+            "recent_turns": [(t.role, t.text) for t in session.turns],
+            "section_ids": session.section_ids,
+        }
+
+    def end(self, session_id):
+        self._drop(session_id)
+        if self.spill_dir:
+            self._spill_path(session_id).unlink(missing_ok=True)
+
+    def sweep(self):
+        """Drop every idle-expired session from memory and the spill tier."""
+        now = self.clock()
+        expired = [sid for sid, s in self._sessions.items() if now - s.last_access > self.ttl]
+        for sid in expired:
+            self._drop(sid)
+        if self.spill_dir:
+            for path in self.spill_dir.glob("*.json"):
+                # _spill stamps mtime with the session's last_access
+                if now - path.stat().st_mtime > self.ttl:
+                    path.unlink(missing_ok=True)
+                    expired.append(path.stem)
+        self.stats["expired"] += len(expired)
+        return len(expired)
+
+    # --------------------------------------
+    # Eviction + spill tier
+    # --------------------------------------
+    def _drop(self, session_id):
+        session = self._sessions.pop(session_id, None)
+        if session is not None:
+            self.bytes -= session.nbytes
+        return session
+
+    def _enforce_cap(self):
+        while self._sessions and (
+            len(self._sessions) > self.max_sessions or self.bytes > self.max_bytes
+        ):
+            session_id, session = next(iter(self._sessions.items()))
+            self._drop(session_id)
+            if self.clock() - session.last_access > self.ttl:
+                self.stats["expired"] += 1
+            elif self.spill_dir:
+                self._spill(session)
+
+    def _spill_path(self, session_id):
+        # session ids come from chat clients: never let them shape the path
+        digest = hashlib.sha256(session_id.encode("utf-8")).hexdigest()
+        return self.spill_dir / f"{digest}.json"
+
+    def _spill(self, session):
+        path = self._spill_path(session.session_id)
+        write_atomic(path, json.dumps(session.to_dict(), separators=(",", ":")))
+        # mtime carries last_access (on self.clock) so sweep() can expire it
+        os.utime(path, (session.last_access, session.last_access))
+        self.stats["spilled"] += 1
+
+    def _reload(self, session_id, now):
+        path = self._spill_path(session_id)
+        if not path.exists():
+            return None
+
+        session = Session.from_dict(json.loads(path.read_text(encoding="utf-8")))
+        path.unlink()
+        if now - session.last_access > self.ttl:
+            self.stats["expired"] += 1
+            return None
+
+        self._sessions[session_id] = session
+        self.bytes += session.nbytes
+        self.stats["reloaded"] += 1
+        self._enforce_cap()
+        return session
+
+
+# ============================================================
+# 3. Benchmark
+# ============================================================
+def benchmark(n_sessions=10_000, turns_per_session=6, lookups=100_000):
+    """Memory per `n_sessions` live sessions and per-turn lookup latency."""
+    import random
+    import tracemalloc
+
+    rng = random.Random(0)
+    section_pool = [f"section-{i:05d}" for i in range(2_000)]
+    questions = [
+        "What is the late payment fee on my card?",
+        "How do I close my savings account?",
+        "What is the minimum balance for the Saving Plus account?",
+        "Can I convert a purchase into EMI?",
+    ]
+
+    tracemalloc.start()
+    start = tracemalloc.take_snapshot()
+
+    store = SessionStore(max_sessions=n_sessions, max_bytes=1 << 40, ttl=3600, spill_dir="")
+    for i in range(n_sessions):
+        sid = f"S{i:06d}"
+        store.get_or_create(sid, customer_id=f"CUST_{i:05d}", product_scope=("cashback",))
+        for _ in range(turns_per_session):
+            store.add_turn(sid, "user", rng.choice(questions))
+            store.add_turn(sid, "assistant", "Answer grounded in the retrieved sections.",
+                           section_ids=rng.sample(section_pool, 3))
+
+    used = sum(s.size_diff for s in tracemalloc.take_snapshot().compare_to(start, "filename"))
+    tracemalloc.stop()
+
+    ids = [f"S{rng.randrange(n_sessions):06d}" for _ in range(lookups)]
+    t0 = time.perf_counter()
+    for sid in ids:
+        store.context(sid)
+    per_lookup = (time.perf_counter() - t0) / lookups
+
+    return {
+        "sessions": n_sessions,
+        "traced_bytes": used,
+        "bytes_per_session": used / n_sessions,
+        "estimated_bytes": store.bytes,
+        "lookup_us": per_lookup * 1e6,
+    }
+
+
+if __name__ == "__main__":
+    for k, v in benchmark().items():
+        print(f"{k}: {v:,.1f}" if isinstance(v, float) else f"{k}: {v:,}")
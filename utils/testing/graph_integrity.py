@@ -0,0 +1,387 @@
+# utils/testing/graph_integrity.py
+
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+
+# --------------------------------------------
+# PARSED JSON FOLDERS PER PRODUCT LINE
+# --------------------------------------------
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+PARSED_FOLDERS = {
+    "Account": REPO_ROOT / "parsed_json" / "Accounts",
+    "CreditCard": REPO_ROOT / "parsed_json" / "parsed_creditcards",
+}
+
+# --------------------------------------------
+# ONE AGGREGATED PASS PER PRODUCT LINE
+# Returns one row per product with its documents and the
+# section / table counts and section types hanging off each one.
+# --------------------------------------------
+PRODUCT_SUMMARY_QUERY = """
+MATCH (p:Product)
+WHERE p.product_line = $product_line
+OPTIONAL MATCH (p)-[:HAS_DOCUMENT]->(d:Document)
+OPTIONAL MATCH (d)-[:HAS_SECTION]->(s:Section)
+OPTIONAL MATCH (s)-[:HAS_TABLE]->(t:Table)
+WITH p, d, s, COUNT(t) AS tables
+WITH p, d,
+     COUNT(s) AS section_count,
+     SUM(tables) AS table_count,
+     COLLECT(DISTINCT toLower(s.type)) AS section_types
+WITH p,
+     COLLECT(CASE WHEN d IS NULL THEN NULL ELSE {
+         file_name: d.file_name,
+         section_count: section_count,
+         table_count: table_count
+     } END) AS documents,
+     COLLECT(section_types) AS type_groups
+RETURN p.product_id AS product_id,
+       documents,
+       reduce(acc = [], ts IN type_groups | acc + ts) AS section_types
+"""
+
+
+# ============================================================
+# 1. Expectations derived from parsed_json/
+# ============================================================
+def _read_json(path):
+    # FORCE UTF-8 — same as ProductIngestor.ingest_json
+    text = Path(path).read_text(encoding="utf-8", errors="ignore")
+    return json.loads(text)
+
+
+def summarize_product(data):
+    """Summarise one parsed product JSON into the shape returned by the graph."""
+    documents = []
+    section_types = set()
+
+    for doc in data["documents"]:
+        sections = doc.get("sections", [])
+        documents.append({
+            "file_name": doc["file_name"],
+            "section_count": len({s["section_id"] for s in sections}),
+            "table_count": len({
+                t["table_id"] for s in sections for t in s.get("tables", [])
+            }),
+        })
+        section_types.update(
+            s.get("type", "Unknown").lower() for s in sections
+        )
+
+    return {
+        "product_id": data["product_id"],
+        "documents": documents,
+        "section_types": sorted(section_types),
+    }
+
+
+def expected_from_parsed_json(folder):
+    """Expected per-product summaries for every JSON file in `folder`."""
+    expected = {}
+    for f in sorted(Path(folder).iterdir()):
+        if f.suffix.lower() == ".json":
+            summary = summarize_product(_read_json(f))
+            expected[summary["product_id"]] = summary
+    return expected
+
+
+# ============================================================
+# 2. Graph sources
+# ============================================================
+class Neo4jGraphSource:
+    """Live graph — one aggregated Cypher query per product line."""
+
+    def __init__(self, db=None):
+        if db is None:
+            # imported lazily so offline checks don't need the neo4j driver
+            from utils.neo4j_connector import Neo4jConnector
+            db = Neo4jConnector()
+        self.db = db
+
+    def product_summaries(self, product_line):
+        rows = self.db.query(PRODUCT_SUMMARY_QUERY, {"product_line": product_line})
+        return {row["product_id"]: row for row in rows}
+
+    def close(self):
+        self.db.close()
+
+
+class InMemoryGraph:
+    """
+    Minimal property-graph stand-in for Neo4j.
+
+    Nodes are keyed by (label, key) using the same MERGE keys as
+    ProductIngestor, so loading parsed JSON or an APOC export yields the
+    same structure the live database would hold.
+    """
+
+    NODE_KEYS = {
+        "Product": "product_id",
+        "Document": "document_id",
+        "Section": "section_id",
+        "Table": "table_id",
+    }
+
+    def __init__(self):
+        self.nodes = {}      # (label, key) -> properties
+        self.edges = {}      # (label, key) -> {rel_type: [(label, key), ...]}
+
+    # --------------------------------------
+    # Building
+    # --------------------------------------
+    def merge_node(self, label, key, **props):
+        node = self.nodes.setdefault((label, key), {})
+        node.update(props)
+        return (label, key)
+
+    def merge_rel(self, start, rel_type, end):
+        targets = self.edges.setdefault(start, {}).setdefault(rel_type, [])
+        if end not in targets:
+            targets.append(end)
+
+    def ingest_json(self, data):
+        """Mirror of ProductIngestor.ingest_json against the in-memory graph."""
+        p = self.merge_node(
+            "Product", data["product_id"],
+            product_name=data["product_name"],
+            product_line=data.get("product_line", ""),
+        )
+
+        for doc in data["documents"]:
+            d = self.merge_node(
+                "Document", f"{data['product_id']}_{doc['file_name']}",
+                file_name=doc["file_name"],
+                source_type=doc["source_type"],
+            )
+            self.merge_rel(p, "HAS_DOCUMENT", d)
+
+            for section in doc.get("sections", []):
+                s = self.merge_node(
+                    "Section", section["section_id"],
+                    title=section.get("title", ""),
+                    type=section.get("type", "Unknown"),
+                )
+                self.merge_rel(d, "HAS_SECTION", s)
+
+                for table in section.get("tables", []):
+                    t = self.merge_node("Table", table["table_id"])
+                    self.merge_rel(s, "HAS_TABLE", t)
+
+    @classmethod
+    def from_parsed_json(cls, *folders):
+        graph = cls()
+        for folder in folders:
+            for f in sorted(Path(folder).iterdir()):
+                if f.suffix.lower() == ".json":
+                    graph.ingest_json(_read_json(f))
+        return graph
+
+    @classmethod
+    def from_apoc_export(cls, path):
+        """
+        Load a snapshot written by
+        `CALL apoc.export.json.all("graph.json", {})` (JSON lines).
+        """
+        graph = cls()
+        ids = {}
+        rels = []
+
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                item = json.loads(line)
+
+                if item["type"] == "node":
+                    label = next(
+                        (l for l in item.get("labels", []) if l in cls.NODE_KEYS),
+                        None,
+                    )
+                    if label is None:
+                        continue
+                    props = item.get("properties", {})
+                    ids[item["id"]] = graph.merge_node(
+                        label, props.get(cls.NODE_KEYS[label]), **props
+                    )
+                elif item["type"] == "relationship":
+                    rels.append(item)
+
+        for rel in rels:
+            start = ids.get(rel["start"]["id"])
+            end = ids.get(rel["end"]["id"])
+            if start and end:
+                graph.merge_rel(start, rel["label"], end)
+
+        return graph
+
+    # --------------------------------------
+    # Querying — same rows as PRODUCT_SUMMARY_QUERY
+    # --------------------------------------
+    def _out(self, node, rel_type):
+        return self.edges.get(node, {}).get(rel_type, [])
+
+    def product_summaries(self, product_line):
+        summaries = {}
+
+        for (label, pid), props in self.nodes.items():
+            if label != "Product" or props.get("product_line") != product_line:
+                continue
+
+            documents = []
+            section_types = set()
+
+            for d in self._out((label, pid), "HAS_DOCUMENT"):
+                sections = self._out(d, "HAS_SECTION")
+                documents.append({
+                    "file_name": self.nodes[d].get("file_name"),
+                    "section_count": len(sections),
+                    "table_count": sum(len(self._out(s, "HAS_TABLE")) for s in sections),
+                })
+                section_types.update(
+                    (self.nodes[s].get("type") or "").lower() for s in sections
+                )
+
+            summaries[pid] = {
+                "product_id": pid,
+                "documents": documents,
+                "section_types": sorted(section_types),
+            }
+
+        return summaries
+
+    def close(self):
+        pass
+
+
+# ============================================================
+# 3. Checker
+# ============================================================
+@dataclass
+class CheckResult:
+    name: str
+    passed: bool
+    details: list = field(default_factory=list)
+
+
+@dataclass
+class IntegrityReport:
+    product_line: str
+    checks: list = field(default_factory=list)
+
+    @property
+    def passed(self):
+        return all(c.passed for c in self.checks)
+
+    @property
+    def failures(self):
+        return [c for c in self.checks if not c.passed]
+
+    def __getitem__(self, name):
+        for c in self.checks:
+            if c.name == name:
+                return c
+        raise KeyError(name)
+
+    def summary(self):
+        lines = [f"Integrity report: {self.product_line}"]
+        for c in self.checks:
+            mark = "✔ PASS" if c.passed else "❌ FAIL"
+            lines.append(f"{mark} — {c.name}")
+            for d in c.details:
+                lines.append(f"    {d}")
+        return "\n".join(lines)
+
+
+def compare_summaries(product_line, actual, expected):
+    """Compare graph summaries with expectations; every invariant in one go."""
+    report = IntegrityReport(product_line)
+
+    # Products present
+    missing = sorted(set(expected) - set(actual))
+    extra = sorted(set(actual) - set(expected))
+    report.checks.append(CheckResult(
+        "products",
+        not missing and not extra,
+        [f"missing: {pid}" for pid in missing] + [f"unexpected: {pid}" for pid in extra],
+    ))
+
+    shared = sorted(set(expected) & set(actual))
+
+    # Product -> Document links
+    details = []
+    for pid in shared:
+        want = {d["file_name"] for d in expected[pid]["documents"]}
+        have = {d["file_name"] for d in actual[pid]["documents"]}
+        if want != have:
+            details.append(f"{pid}: expected {sorted(want)}, found {sorted(have)}")
+    report.checks.append(CheckResult("documents", not details, details))
+
+    # Per-document section and table counts
+    for key, name in (("section_count", "section_counts"), ("table_count", "table_counts")):
+        details = []
+        for pid in shared:
+            have = {d["file_name"]: d[key] for d in actual[pid]["documents"]}
+            for doc in expected[pid]["documents"]:
+                found = have.get(doc["file_name"])
+                if found is not None and found != doc[key]:
+                    details.append(
+                        f"{pid}/{doc['file_name']}: expected {doc[key]}, found {found}"
+                    )
+        report.checks.append(CheckResult(name, not details, details))
+
+    # Section types
+    details = []
+    for pid in shared:
+        lost = sorted(set(expected[pid]["section_types"]) - set(actual[pid]["section_types"]))
+        if lost:
+            details.append(f"{pid}: missing types {lost}")
+    report.checks.append(CheckResult("section_types", not details, details))
+
+    # Orphans
+    details = []
+    for pid, row in sorted(actual.items()):
+        if not row["documents"]:
+            details.append(f"orphan product: {pid}")
+        for doc in row["documents"]:
+            if doc["section_count"] == 0:
+                details.append(f"orphan document: {pid}/{doc['file_name']}")
+    report.checks.append(CheckResult("orphans", not details, details))
+
+    return report
+
+
+class GraphIntegrityChecker:
+
+    def __init__(self, source):
+        self.source = source
+
+    def check(self, product_line, expected=None):
+        if expected is None:
+            expected = expected_from_parsed_json(PARSED_FOLDERS[product_line])
+        actual = self.source.product_summaries(product_line)
+        return compare_summaries(product_line, actual, expected)
+
+    def check_all(self):
+        return {line: self.check(line) for line in PARSED_FOLDERS}
+
+
+# ============================================================
+# 4. Manual runner (live database)
+# ============================================================
+def run_integrity_checks():
+    source = Neo4jGraphSource()
+    try:
+        reports = GraphIntegrityChecker(source).check_all()
+    finally:
+        source.close()
+
+    for report in reports.values():
+        print(report.summary(), "\n")
+    return reports
+
+
+if __name__ == "__main__":
+    run_integrity_checks()
@@ -0,0 +1,103 @@
+import pytest
+
+from utils.llm.context_packer import ContextPacker, estimate_tokens
+
+BOILERPLATE = "The Cardholder shall pay the Total Amount Due by the Payment Due Date."
+
+
+def _section(sid, title, text="", tables=None, structured=None):
+    return {
+        "section_id": sid,
+        "product_id": "cashback",
+        "title": title,
+        "text": text,
+        "tables": tables or [],
+        "structured": structured or {},
+    }
+
+
+def test_estimate_tokens_scales_with_text():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("late fee") == 2
+    assert estimate_tokens("late fee " * 100) == 200
+
+
+def test_prompt_stays_within_budget_and_reports_tokens():
+    huge = " ".join(f"Clause {i} applies to every transaction on the card." for i in range(2000))
+    sections = [_section("s1", "Legal T&C", huge), _section("s2", "Fees", "Late fee is Rs 500.")]
+    packer = ContextPacker(token_budget=300, max_section_share=0.5)
+
+    packed = packer.pack("What is the late fee?", sections, request_id="q1")
+
+    assert packed.tokens <= 300
+    assert packed.raw_tokens > packed.tokens
+    assert packed.sentences_over_budget > 0
+    # the oversized first section cannot starve the second
+    assert packed.sections_used == ["s1", "s2"]
+    assert "Late fee is Rs 500." in packed.prompt
+    assert packed.prompt.rstrip().endswith("What is the late fee?")
+    assert packer.token_report()["requests"] == 1
+
+
+def test_budget_counts_separators_with_custom_counter():
+    sections = [
+        _section(f"s{i}", f"Section {i}", " ".join(f"Clause {i}.{j} applies here." for j in range(40)))
+        for i in range(5)
+    ]
+    profile = {"customer_id": "CUST_00001", "city": "Surat"}
+    packer = ContextPacker(token_budget=500, max_section_share=0.5, count_tokens=len)
+
+    packed = packer.pack("What is the late fee?", sections, profile)
+
+    assert packed.tokens == len(packed.prompt) <= 500
+    assert len(packed.sections_used) > 1
+
+
+def test_question_over_budget_rejected():
+    packer = ContextPacker(token_budget=10, max_section_share=0.5, count_tokens=len)
+    with pytest.raises(ValueError):
+        packer.pack("What is the late payment fee?", [_section("s1", "Fees", "Rs 500.")])
+
+
+def test_structured_fields_and_tables_come_before_text():
+    section = _section(
+        "s1", "Fees",
+        text="Charges are subject to change. " + BOILERPLATE,
+        tables=[{"table_id": "t1", "json": [{"Fee": "Late payment", "Amount": "Rs 500"}]}],
+        structured={"late_payment_fee": "Rs 500", "billing_cycle": ""},
+    )
+    packed = ContextPacker(token_budget=1000, max_section_share=1.0).pack("fee?", [section])
+
+    prompt = packed.prompt
+    assert '"late_payment_fee":"Rs 500"' in prompt
+    assert "billing_cycle" not in prompt
+    assert prompt.index("late_payment_fee") < prompt.index("Late payment | Rs 500")
+    assert prompt.index("Late payment | Rs 500") < prompt.index("Charges are subject")
+
+
+def test_redundant_sentences_dropped_across_sections():
+    sections = [
+        _section("s1", "Billing", BOILERPLATE),
+        _section("s2", "Terms", BOILERPLATE.upper() + " Interest accrues daily."),
+    ]
+    packed = ContextPacker(token_budget=1000, max_section_share=1.0).pack("due date?", sections)
+
+    assert packed.prompt.lower().count("total amount due") == 1
+    assert packed.sentences_duplicate == 1
+    assert "Interest accrues daily." in packed.prompt
+
+
+def test_profile_and_fact_rows_rendered_compactly():
+    profile = {"customer_id": "CUST_00001", "city": "Surat", "pan": "QCCDB0247A", "credit_score": 699}
+    facts = {"Credit cards": [{"card_id": "CC_002", "credit_limit": 13396, "card_status": "active"}]}
+    packed = ContextPacker(token_budget=500, max_section_share=0.5).pack("limit?", [], profile, facts)
+
+    assert "customer_id: CUST_00001; city: Surat; credit_score: 699" in packed.prompt
+    assert "QCCDB0247A" not in packed.prompt
+    assert "CC_002 | 13396 | active" in packed.prompt
+
+
+def test_budget_defaults_from_config():
+    packer = ContextPacker()
+    assert packer.token_budget == 6000
+    assert packer.max_section_share == 0.5
@@ -0,0 +1,72 @@
+import numpy as np
+
+from utils.ingestion.dedup_sections import (
+    MinHasher,
+    chunk_product,
+    chunk_text,
+    deduplicate,
+    estimate_jaccard,
+    shingle_hashes,
+)
+
+AGREEMENT = " ".join(
+    f"Clause {i}. The Cardholder shall pay the Total Amount Due by the Payment Due Date "
+    f"shown in statement number {i}, failing which late payment charges apply."
+    for i in range(30)
+)
+
+
+def _product(pid, text):
+    return {
+        "product_id": pid,
+        "documents": [{"sections": [{"section_id": f"{pid}_s1", "text": text}]}],
+    }
+
+
+def test_chunk_boundaries_are_content_defined():
+    base = chunk_text(AGREEMENT)
+    shifted = chunk_text("Welcome to your new card. " * 3 + AGREEMENT)
+    assert len(base) > 1
+    # a shifted start only disturbs the first couple of chunks
+    assert base[-3:] == shifted[-3:]
+
+
+def test_chunks_never_exceed_max_words():
+    run_on = " ".join(["clause"] * 927) + ". " + AGREEMENT
+    for text in (run_on, AGREEMENT):
+        chunks = chunk_text(text, max_words=100)
+        assert chunks
+        assert max(len(c.split()) for c in chunks) <= 100
+        assert sum(len(c.split()) for c in chunks) == len(text.split())
+
+
+def test_minhash_estimates_similarity():
+    hasher = MinHasher()
+    a = hasher.signature(shingle_hashes(AGREEMENT))
+    b = hasher.signature(shingle_hashes(AGREEMENT.replace("Clause 3.", "Clause three.")))
+    c = hasher.signature(shingle_hashes("Interest is credited quarterly on daily balances."))
+    assert estimate_jaccard(a, a) == 1.0
+    assert estimate_jaccard(a, b) > 0.8
+    assert estimate_jaccard(a, c) < 0.2
+    assert a.dtype == np.uint64
+
+
+def test_shared_text_stored_once_per_cluster():
+    records = (
+        chunk_product(_product("cashback", AGREEMENT))
+        + chunk_product(_product("pulse", AGREEMENT.replace("Clause 7.", "Clause seven.")))
+        + chunk_product(_product("minor", "Interest is credited quarterly on daily balances."))
+    )
+
+    result = deduplicate(records)
+    report = result.report
+
+    assert report.total_chunks == len(records)
+    assert report.canonical_chunks < report.total_chunks
+    assert report.cross_product_clusters >= 1
+    assert report.chars_saved > 0
+    assert report.embeddings_saved == report.total_chunks - report.canonical_chunks
+    for rec in records:
+        assert result.mapping[rec["chunk_id"]] in result.canonical
+    shared = [c for c, p in result.products.items() if p == {"cashback", "pulse"}]
+    assert shared
@@ -0,0 +1,151 @@
+import asyncio
+
+import pytest
+
+from utils.config import REPO_ROOT
+from utils.llm.client import FakeLLMClient, TokenBucket
+from utils.llm.faq_matrix import TOPICS, FAQMatrixBuilder, FAQStore
+
+
+def _product(fee_text="Annual fee is Rs 499."):
+    return {
+        "product_id": "cashback",
+        "product_name": "Cashback SBI Card",
+        "product_line": "CreditCard",
+        "documents": [{"sections": [
+            {"section_id": "s1", "type": "fees", "title": "FEES", "text": fee_text, "tables": []},
+            {"section_id": "s2", "type": "rewards", "title": "REWARDS",
+             "text": "5% cashback on online spends.", "tables": []},
+            {"section_id": "s3", "type": "billing", "title": "BILLING", "text": "", "tables": []},
+        ]}],
+    }
+
+
+class ConcurrencyProbe(FakeLLMClient):
+
+    def __init__(self):
+        super().__init__(latency=0.01)
+        self.active = 0
+        self.peak = 0
+
+    async def generate(self, prompt):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            return await super().generate(prompt)
+        finally:
+            self.active -= 1
+
+
+def _builder(client, tmp_path, **kwargs):
+    kwargs.setdefault("requests_per_second", 1000)
+    return FAQMatrixBuilder(client, store=FAQStore(tmp_path / "faq.json"), **kwargs)
+
+
+def test_every_topic_cell_is_filled(tmp_path):
+    client = FakeLLMClient()
+    report = asyncio.run(_builder(client, tmp_path).build([_product()]))
+
+    assert sorted(report.generated) == ["cashback::fees", "cashback::rewards"]
+    assert len(report.not_covered) == len(TOPICS["CreditCard"]) - 2
+    assert len(client.calls) == 2
+    assert "Annual fee is Rs 499." in next(c for c in client.calls if "fees" in c)
+
+    store = FAQStore(tmp_path / "faq.json")
+    assert store.answer("cashback", "FEES").startswith("[fake answer]")
+    assert store.answer("cashback", "billing") is None
+    assert store.get("cashback", "fees")["section_ids"] == ["s1"]
+
+
+def test_only_changed_cells_are_regenerated(tmp_path):
+    asyncio.run(_builder(FakeLLMClient(), tmp_path).build([_product()]))
+
+    client = FakeLLMClient()
+    report = asyncio.run(_builder(client, tmp_path).build([_product("Annual fee is Rs 999.")]))
+
+    assert report.generated == ["cashback::fees"]
+    assert "cashback::rewards" in report.unchanged
+    assert len(client.calls) == 1
+
+
+def test_failed_regeneration_stops_serving_old_answer(tmp_path):
+    asyncio.run(_builder(FakeLLMClient(reply=lambda p: "Rs 499"), tmp_path).build([_product()]))
+    assert FAQStore(tmp_path / "faq.json").answer("cashback", "fees") == "Rs 499"
+
+    def boom(prompt):
+        raise TimeoutError("deadline exceeded")
+
+    changed = _product("Annual fee is Rs 999.")
+    report = asyncio.run(_builder(FakeLLMClient(reply=boom), tmp_path).build([changed]))
+    assert set(report.failed) == {"cashback::fees"}
+
+    store = FAQStore(tmp_path / "faq.json")
+    assert store.answer("cashback", "fees") is None
+    assert store.answer("cashback", "rewards") == "Rs 499"
+
+    report = asyncio.run(_builder(FakeLLMClient(reply=lambda p: "Rs 999"), tmp_path).build([changed]))
+    assert report.generated == ["cashback::fees"]
+    assert FAQStore(tmp_path / "faq.json").answer("cashback", "fees") == "Rs 999"
+
+
+def test_failures_are_reported_and_retried_next_run(tmp_path):
+    def boom(prompt):
+        raise TimeoutError("deadline exceeded")
+
+    report = asyncio.run(_builder(FakeLLMClient(reply=boom), tmp_path).build([_product()]))
+    assert set(report.failed) == {"cashback::fees", "cashback::rewards"}
+
+    report = asyncio.run(_builder(FakeLLMClient(), tmp_path).build([_product()]))
+    assert len(report.generated) == 2
+
+
+def test_concurrency_is_bounded(tmp_path):
+    products = []
+    for i in range(6):
+        p = _product()
+        p["product_id"] = f"card_{i}"
+        products.append(p)
+
+    client = ConcurrencyProbe()
+    asyncio.run(_builder(client, tmp_path, max_concurrency=3).build(products))
+
+    assert len(client.calls) == 12
+    assert client.peak == 3
+
+
+def test_token_bucket_limits_rate():
+    now = [0.0]
+
+    async def fake_sleep(seconds):
+        now[0] += seconds
+
+    async def take(n):
+        bucket = TokenBucket(rate=100, capacity=1, clock=lambda: now[0], sleep=fake_sleep)
+        for _ in range(n):
+            await bucket.acquire()
+
+    asyncio.run(take(11))
+    assert now[0] == pytest.approx(0.1)
+
+
+def test_answers_saved_when_a_job_raises(tmp_path):
+    class BrokenPacker:
+        def pack(self, question, sections, request_id=None):
+            if "rewards" in request_id:
+                raise RuntimeError("packer failed")
+            return type("Packed", (), {"prompt": question, "tokens": 1})()
+
+    builder = _builder(FakeLLMClient(), tmp_path, packer=BrokenPacker())
+    report = asyncio.run(builder.build([_product()]))
+
+    assert report.generated == ["cashback::fees"]
+    assert "packer failed" in report.failed["cashback::rewards"]
+    assert FAQStore(tmp_path / "faq.json").answer("cashback", "fees") is not None
+
+
+def test_default_store_resolves_from_repo_root(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    builder = FAQMatrixBuilder(FakeLLMClient())
+
+    assert builder.store.path == REPO_ROOT / "Data" / "faq_matrix.json"
+    assert "parsed_json" not in builder.store.path.parts
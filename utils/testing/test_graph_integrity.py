@@ -0,0 +1,103 @@
+import json
+
+import pytest
+
+from utils.testing.graph_integrity import (
+    PARSED_FOLDERS,
+    REPO_ROOT,
+    GraphIntegrityChecker,
+    InMemoryGraph,
+    Neo4jGraphSource,
+    expected_from_parsed_json,
+)
+
+ACCOUNTS = PARSED_FOLDERS["Account"]
+CREDIT_CARDS = PARSED_FOLDERS["CreditCard"]
+
+
+@pytest.fixture(scope="module")
+def expected():
+    return {
+        "Account": expected_from_parsed_json(ACCOUNTS),
+        "CreditCard": expected_from_parsed_json(CREDIT_CARDS),
+    }
+
+
+@pytest.fixture
+def graph():
+    return InMemoryGraph.from_parsed_json(ACCOUNTS, CREDIT_CARDS)
+
+
+@pytest.mark.parametrize("product_line", ["Account", "CreditCard"])
+def test_clean_ingestion_passes(graph, expected, product_line):
+    report = GraphIntegrityChecker(graph).check(product_line, expected[product_line])
+    assert report.passed, report.summary()
+
+
+def test_default_expectations_independent_of_cwd(graph, monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    assert GraphIntegrityChecker(graph).check("Account").passed
+
+
+def test_account_expectations_match_old_suite(expected):
+    accounts = expected["Account"]
+    assert len(accounts) == 7
+    for summary in accounts.values():
+        assert summary["documents"][0]["section_count"] >= 10
+        for keyword in ["features", "eligibility", "kyc", "mitc", "fees"]:
+            assert any(keyword in t for t in summary["section_types"])
+
+
+def test_detects_missing_product_and_orphan_document(graph, expected):
+    del graph.nodes[("Product", "saving_bank_account")]
+    doc = ("Document", "minor_saving_account_minor saving account.docx")
+    graph.edges[doc].pop("HAS_SECTION")
+
+    report = GraphIntegrityChecker(graph).check("Account", expected["Account"])
+
+    assert not report["products"].passed
+    assert report["products"].details == ["missing: saving_bank_account"]
+    assert not report["section_counts"].passed
+    assert not report["orphans"].passed
+    assert report["documents"].passed
+
+
+def test_apoc_snapshot_round_trip(tmp_path):
+    lines = [
+        {"type": "node", "id": "0", "labels": ["Product"],
+         "properties": {"product_id": "p1", "product_line": "Account"}},
+        {"type": "node", "id": "1", "labels": ["Document"],
+         "properties": {"document_id": "p1_a.docx", "file_name": "a.docx"}},
+        {"type": "node", "id": "2", "labels": ["Section"],
+         "properties": {"section_id": "s1", "type": "Fees & Charges"}},
+        {"type": "relationship", "label": "HAS_DOCUMENT",
+         "start": {"id": "0"}, "end": {"id": "1"}},
+        {"type": "relationship", "label": "HAS_SECTION",
+         "start": {"id": "1"}, "end": {"id": "2"}},
+    ]
+    path = tmp_path / "graph.json"
+    path.write_text("\n".join(json.dumps(l) for l in lines), encoding="utf-8")
+
+    graph = InMemoryGraph.from_apoc_export(path)
+    want = {"p1": {
+        "product_id": "p1",
+        "documents": [{"file_name": "a.docx", "section_count": 1, "table_count": 0}],
+        "section_types": ["fees & charges"],
+    }}
+
+    assert GraphIntegrityChecker(graph).check("Account", want).passed
+
+
+@pytest.mark.skipif(
+    not (REPO_ROOT / ".secrets" / "neo4j.env").exists(),
+    reason="no live Neo4j credentials",
+)
+@pytest.mark.parametrize("product_line", ["Account", "CreditCard"])
+def test_live_graph(expected, product_line):
+    pytest.importorskip("neo4j")
+    source = Neo4jGraphSource()
+    try:
+        report = GraphIntegrityChecker(source).check(product_line, expected[product_line])
+    finally:
+        source.close()
+    assert report.passed, report.summary()
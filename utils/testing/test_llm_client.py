@@ -0,0 +1,166 @@
+import asyncio
+
+import pytest
+
+from utils.llm.client import FakeLLMClient, ResilientLLMClient, TransientError
+
+
+def _client(provider, **kwargs):
+    defaults = dict(
+        requests_per_second=1000, burst=1000, max_concurrency=8, timeout=1.0,
+        hedge_after=0, max_attempts=1, backoff=0.01, batch_size=1, batch_window=0.01,
+    )
+    defaults.update(kwargs)
+    return ResilientLLMClient(provider, **defaults)
+
+
+async def _burst(client, prompts):
+    return await asyncio.gather(*(client.generate(p) for p in prompts))
+
+
+def test_identical_in_flight_prompts_share_one_call():
+    provider = FakeLLMClient(latency=0.05)
+    client = _client(provider)
+    prompts = ["What is the late fee?"] * 20 + ["  what is the LATE fee? "] * 5 + ["Annual fee?"]
+
+    answers = asyncio.run(_burst(client, prompts))
+
+    assert len(provider.calls) == 2
+    assert client.stats["coalesced"] == 24
+    assert answers[0] == answers[24] == "[fake answer] What is the late fee?"
+
+
+def test_completed_prompts_are_not_cached():
+    provider = FakeLLMClient()
+    client = _client(provider)
+
+    async def twice():
+        await client.generate("q")
+        await client.generate("q")
+
+    asyncio.run(twice())
+    assert len(provider.calls) == 2
+
+
+def test_throttling_is_retried_with_backoff():
+    provider = FakeLLMClient(max_rps=3)
+    client = _client(provider, max_attempts=5, backoff=0.3)
+
+    answers = asyncio.run(_burst(client, [f"q{i}" for i in range(5)]))
+
+    assert len(answers) == 5
+    assert provider.throttled >= 2
+    assert client.stats["retries"] == client.stats["throttled"]
+
+
+def test_rate_limiter_prevents_throttling():
+    provider = FakeLLMClient(max_rps=5)
+    client = _client(provider, requests_per_second=4, burst=1)
+
+    asyncio.run(_burst(client, [f"q{i}" for i in range(6)]))
+
+    assert provider.throttled == 0
+    assert client.stats["provider_calls"] == 6
+
+
+def test_slow_call_is_hedged():
+    delays = iter([0.5, 0.01])
+
+    class SlowFirst(FakeLLMClient):
+        async def generate(self, prompt):
+            self.calls.append(prompt)
+            await asyncio.sleep(next(delays))
+            return "ok"
+
+    provider = SlowFirst()
+    client = _client(provider, hedge_after=0.05)
+
+    assert asyncio.run(client.generate("q")) == "ok"
+    assert client.stats["hedges"] == 1
+    assert len(provider.calls) == 2
+
+
+def test_timeout_raises_after_last_attempt():
+    client = _client(FakeLLMClient(latency=0.2), timeout=0.05, max_attempts=2)
+
+    with pytest.raises(TimeoutError):
+        asyncio.run(client.generate("q"))
+    assert client.stats["timeouts"] == 2
+
+
+def test_transient_provider_errors_are_retried():
+    failures = []
+
+    def flaky(prompt):
+        if len(failures) < 2:
+            failures.append(prompt)
+            raise TransientError("503 service unavailable")
+        return "ok"
+
+    client = _client(FakeLLMClient(reply=flaky), max_attempts=3)
+
+    assert asyncio.run(client.generate("q")) == "ok"
+    assert client.stats["transient"] == client.stats["retries"] == 2
+
+
+def test_other_errors_are_not_retried():
+    def boom(prompt):
+        raise ValueError("bad prompt")
+
+    client = _client(FakeLLMClient(reply=boom), max_attempts=3)
+
+    with pytest.raises(ValueError):
+        asyncio.run(client.generate("q"))
+    assert client.stats["retries"] == 0
+
+
+def test_micro_batching_when_provider_supports_it():
+    provider = FakeLLMClient(latency=0.01, supports_batch=True)
+    client = _client(provider, batch_size=4, batch_window=0.02)
+
+    answers = asyncio.run(_burst(client, [f"q{i}" for i in range(10)]))
+
+    assert answers == [f"[fake answer] q{i}" for i in range(10)]
+    assert [len(b) for b in provider.batches] == [4, 4, 2]
+    assert client.stats["provider_calls"] == 3
+
+
+def test_no_batching_without_provider_support():
+    provider = FakeLLMClient()
+    client = _client(provider, batch_size=4)
+
+    asyncio.run(_burst(client, ["a", "b"]))
+    assert client.batcher is None
+    assert provider.batches == []
+
+
+def test_batch_queue_time_counts_against_neither_timeout_nor_hedge():
+    provider = FakeLLMClient(latency=0.01, supports_batch=True)
+    client = _client(provider, requests_per_second=5, burst=1, timeout=0.1,
+                     hedge_after=0.05, batch_size=2, batch_window=0.01)
+
+    answers = asyncio.run(_burst(client, [f"q{i}" for i in range(6)]))
+
+    assert len(answers) == 6
+    assert client.stats["batches"] == 3
+    assert client.stats["timeouts"] == 0
+    assert client.stats["hedges"] == 0
+
+
+def test_short_batch_result_fails_fast():
+    class ShortBatch(FakeLLMClient):
+        async def generate_batch(self, prompts):
+            return ["only one"]
+
+    client = _client(ShortBatch(supports_batch=True), timeout=5.0,
+                     batch_size=2, batch_window=0.01)
+
+    async def run():
+        return await asyncio.wait_for(
+            asyncio.gather(client.generate("a"), client.generate("b"), return_exceptions=True),
+            1.0,
+        )
+
+    first, second = asyncio.run(run())
+    assert first == "only one"
+    assert isinstance(second, RuntimeError)
@@ -0,0 +1,107 @@
+import pandas as pd
+import pytest
+
+from utils.analytics.portfolio_views import PortfolioViews
+
+CUSTOMER_COLS = ["customer_id", "city", "customer_segment", "is_delinquent"]
+CARD_COLS = ["customer_id", "card_id", "credit_limit", "current_outstanding",
+             "card_status", "is_delinquent"]
+ACCOUNT_COLS = ["customer_id", "account_type", "account_status", "current_balance"]
+
+
+def _write_batch(folder, suffix, customers, cards, accounts):
+    folder.mkdir(parents=True, exist_ok=True)
+    pd.DataFrame(customers, columns=CUSTOMER_COLS).to_csv(folder / f"customers_5000{suffix}.csv", index=False)
+    pd.DataFrame(cards, columns=CARD_COLS).to_csv(
+        folder / f"customer_credit_card_holdings_5000{suffix}.csv", index=False)
+    pd.DataFrame(accounts, columns=ACCOUNT_COLS).to_csv(
+        folder / f"customer_account_holdings_5000{suffix}.csv", index=False)
+
+
+@pytest.fixture
+def data(tmp_path):
+    root = tmp_path / "updated data"
+    _write_batch(
+        root, "",
+        customers=[("C1", "Surat", "retail", "FALSE"), ("C2", "Pune", "premium", "TRUE")],
+        cards=[
+            ("C1", "CC_002", 10000, 500, "active", "False"),
+            ("C2", "CC_002", 20000, 19000, "blocked", "True"),
+            ("C2", "CC_001", 50000, 60000, "active", "True"),
+        ],
+        accounts=[("C1", "Saving Bank Account", "active", 1000)],
+    )
+    meta = tmp_path / "meta.csv"
+    pd.DataFrame(
+        [("CC_001", "Apollo SBI Card SELECT"), ("CC_002", "Cashback SBI Card")],
+        columns=["card_id", "card_name"],
+    ).to_csv(meta, index=False)
+    return root, meta, tmp_path / "cache.json"
+
+
+def _views(data):
+    root, meta, cache = data
+    return PortfolioViews(data_root=root, card_metadata=meta, cache_path=cache)
+
+
+def test_views_materialized_from_first_batch(data):
+    views = _views(data)
+    assert views.refresh() == ["batch1"]
+
+    cashback = views.lookup("delinquent_by_card", "CC_002")
+    assert cashback["card_name"] == "Cashback SBI Card"
+    assert cashback["cards"] == 2
+    assert cashback["delinquent_customers"] == 1
+    assert cashback["delinquency_rate"] == 0.5
+
+    assert views.lookup("utilization_by_segment", "retail", "0-10%")["cards"] == 1
+    assert views.lookup("utilization_by_segment", "premium", ">100%")["share"] == 0.5
+    assert views.lookup("accounts_by_type", "Saving Bank Account", "active")["balance"] == 1000
+
+
+def test_new_batch_is_added_incrementally(data):
+    root, _, _ = data
+    views = _views(data)
+    views.refresh()
+
+    _write_batch(
+        root / "batch2", "_batch2",
+        customers=[("C3", "Surat", "retail", "False")],
+        cards=[("C3", "CC_002", 10000, 2000, "dormant", "False")],
+        accounts=[("C3", "Saving Bank Account", "dormant", 500)],
+    )
+
+    assert views.refresh() == ["batch2"]
+    assert views.refresh() == []
+
+    surat = views.lookup("dormant_by_city", "Surat")
+    assert (surat["cards"], surat["dormant_cards"], surat["dormant_share"]) == (2, 1, 0.5)
+    assert views.lookup("delinquent_by_card", "CC_002")["cards"] == 3
+
+
+def test_views_served_from_cache_after_restart(data):
+    _views(data).refresh()
+
+    restarted = _views(data)
+    assert restarted.lookup("dormant_by_city", "Pune")["cards"] == 2
+    assert restarted.refresh() == []
+    assert list(restarted.get("delinquent_by_card")["card_id"]) == ["CC_001", "CC_002"]
+
+
+def test_card_metadata_edit_renames_without_reaggregating(data):
+    _, meta, _ = data
+    views = _views(data)
+    views.refresh()
+
+    pd.DataFrame(
+        [("CC_001", "Apollo SBI Card SELECT"), ("CC_002", "Cashback SBI Card Plus")],
+        columns=["card_id", "card_name"],
+    ).to_csv(meta, index=False)
+
+    assert views.refresh() == []
+    by_card = views.get("delinquent_by_card")
+    assert list(by_card["card_id"]) == ["CC_001", "CC_002"]
+    assert views.lookup("delinquent_by_card", "CC_002")["card_name"] == "Cashback SBI Card Plus"
+
+    restarted = _views(data)
+    assert restarted.lookup("delinquent_by_card", "CC_002")["card_name"] == "Cashback SBI Card Plus"
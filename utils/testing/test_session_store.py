@@ -0,0 +1,143 @@
+import pytest
+
+from utils.sessions.session_store import Session, SessionStore, Turn
+
+
+class Clock:
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+def _store(clock, **kwargs):
+    defaults = dict(max_sessions=100, max_bytes=1 << 20, ttl=60, max_turns=4,
+                    max_summary_chars=200, spill_dir="", clock=clock)
+    defaults.update(kwargs)
+    return SessionStore(**defaults)
+
+
+def test_records_use_slots():
+    assert not hasattr(Session("s"), "__dict__")
+    assert not hasattr(Turn("user", "hi"), "__dict__")
+
+
+def test_turn_keeps_section_references_not_text(clock):
+    store = _store(clock)
+    store.get_or_create("s1", customer_id="CUST_00001", product_scope=["cashback"])
+    store.add_turn("s1", "user", "What is the late fee?")
+    store.add_turn("s1", "assistant", "Rs 500.", section_ids=["sec-a", "sec-b"])
+    store.add_turn("s1", "assistant", "See billing.", section_ids=["sec-b", "sec-c"])
+
+    other = _store(clock)
+    # built at runtime so only interning can make it the same object
+    other.add_turn("s2", "assistant", "x", section_ids=["".join(["sec-", "a"])])
+
+    ctx = store.context("s1")
+    assert ctx["customer_id"] == "CUST_00001"
+    assert ctx["product_scope"] == ("cashback",)
+    assert ctx["section_ids"] == ("sec-b", "sec-c", "sec-a")
+    assert other.get("s2").section_ids[0] is ctx["section_ids"][2]
+
+
+def test_old_turns_are_folded_into_summary(clock):
+    store = _store(clock, max_turns=2)
+    for q in ["fee?", "limit?", "closure?"]:
+        store.add_turn("s1", "user", q)
+
+    session = store.get("s1")
+    assert [t.text for t in session.turns] == ["limit?", "closure?"]
+    assert session.summary == "fee?"
+
+
+def test_lru_eviction_on_session_cap(clock):
+    store = _store(clock, max_sessions=2)
+    store.add_turn("a", "user", "q")
+    store.add_turn("b", "user", "q")
+    store.get("a")
+    store.add_turn("c", "user", "q")
+
+    assert store.get("b") is None
+    assert store.get("a") is not None
+    assert len(store) == 2
+
+
+def test_byte_cap_is_enforced(clock):
+    store = _store(clock, max_bytes=2_000)
+    for i in range(20):
+        store.add_turn(f"s{i}", "user", "x" * 300)
+
+    assert store.bytes <= 2_000
+    assert store.bytes == sum(s.nbytes for s in store._sessions.values())
+    assert store.get("s19") is not None
+
+
+def test_ttl_expiry(clock):
+    store = _store(clock, ttl=60)
+    store.add_turn("a", "user", "q")
+    store.add_turn("b", "user", "q")
+
+    clock.now += 30
+    store.get("b")
+    clock.now += 45
+
+    assert store.get("a") is None
+    assert store.sweep() == 0
+    clock.now += 61
+    assert store.sweep() == 1
+    assert len(store) == 0 and store.bytes == 0
+
+
+def test_evicted_sessions_spill_to_disk_and_reload(clock, tmp_path):
+    store = _store(clock, max_sessions=1, spill_dir=tmp_path)
+    store.get_or_create("a", customer_id="CUST_1", product_scope=["minor_saving_account"])
+    store.add_turn("a", "assistant", "ok", section_ids=["sec-1"])
+    store.add_turn("b", "user", "q")
+
+    assert store._spill_path("a").exists()
+    assert store.stats["spilled"] == 1
+
+    session = store.get("a")
+    assert session.customer_id == "CUST_1"
+    assert session.section_ids == ("sec-1",)
+    assert not store._spill_path("a").exists()
+    assert store._spill_path("b").exists()
+    assert store.stats["reloaded"] == 1
+
+    store.end("b")
+    assert not store._spill_path("b").exists()
+    assert store.get("b") is None
+
+
+def test_spill_files_stay_inside_spill_dir(clock, tmp_path):
+    spill = tmp_path / "spill"
+    store = _store(clock, max_sessions=1, spill_dir=spill)
+    store.add_turn("../escaped", "user", "q")
+    store.add_turn("b", "user", "q")
+
+    assert not (tmp_path / "escaped.json").exists()
+    assert [p.parent for p in tmp_path.rglob("*.json")] == [spill]
+    assert store.get("../escaped").turns[0].text == "q"
+
+
+def test_sweep_expires_spilled_sessions_by_last_access(clock, tmp_path):
+    store = _store(clock, max_sessions=1, ttl=60, spill_dir=tmp_path)
+    store.add_turn("a", "user", "q")
+    clock.now += 30
+    store.add_turn("b", "user", "q")
+    assert store._spill_path("a").exists()
+
+    clock.now += 20
+    assert store.sweep() == 0
+    assert store._spill_path("a").exists()
+
+    clock.now += 10_000
+    assert store.sweep() == 2
+    assert not store._spill_path("a").exists()